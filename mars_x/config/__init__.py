@@ -4,11 +4,13 @@ This module provides tools to read, write and manage game configuration settings
 """
 
 import os
-import configparser
 import shutil
 import sys
+import logging
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Try to import appdirs, but provide a fallback
 try:
     import appdirs
@@ -24,7 +26,7 @@ CONFIG_FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "con
 # Check if config directory path is overridden (e.g., by packaged app)
 if "MARS_X_CONFIG_DIR" in os.environ:
     CONFIG_FILES_DIR = os.environ["MARS_X_CONFIG_DIR"]
-    print(f"Using configuration directory from environment: {CONFIG_FILES_DIR}")
+    logger.info("Using configuration directory from environment: %s", CONFIG_FILES_DIR)
 
 # Ensure directories exist
 os.makedirs(CONFIG_FILES_DIR, exist_ok=True)
@@ -33,6 +35,12 @@ os.makedirs(USER_CONFIG_DIR, exist_ok=True)
 # Create path to user configuration
 USER_CONFIG = os.path.join(USER_CONFIG_DIR, "config.ini")
 
+# Default config files copied into the user directory: (name, source, destination)
+_CONFIG_FILES = tuple(
+    (name, os.path.join(CONFIG_FILES_DIR, name), os.path.join(USER_CONFIG_DIR, name))
+    for name in ('engine.ini', 'build.ini')
+)
+
 # Import configs (deferred to avoid circular imports)
 def _import_configs():
     global engine_config, build_config
@@ -44,9 +52,18 @@ def _import_configs():
     build_config = BuildConfig()
     return engine_config, build_config
 
-# Placeholder config instances that will be initialized later
-engine_config = None
-build_config = None
+def _get_configs():
+    """Return the global config instances, constructing them on first use."""
+    if 'engine_config' not in globals() or 'build_config' not in globals():
+        return _import_configs()
+    return engine_config, build_config
+
+def __getattr__(name):
+    """Lazily construct `engine_config`/`build_config` on first access (PEP 562)."""
+    if name in ('engine_config', 'build_config'):
+        _import_configs()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def initialize():
     """
@@ -54,9 +71,7 @@ def initialize():
     Loads default and user configurations.
     """
     # Import configs if needed
-    global engine_config, build_config
-    if engine_config is None or build_config is None:
-        engine_config, build_config = _import_configs()
+    engine_config, build_config = _get_configs()
     
     # Copy default configuration files to user directory if they don't exist
     _ensure_config_files_exist()
@@ -65,32 +80,28 @@ def initialize():
     engine_config.load()
     build_config.load()
     
-    print(f"Configuration loaded from {USER_CONFIG_DIR}")
+    logger.info("Configuration loaded from %s", USER_CONFIG_DIR)
     return True
 
 def save_all():
     """Save all configuration to disk."""
     # Import configs if needed
-    global engine_config, build_config
-    if engine_config is None or build_config is None:
-        engine_config, build_config = _import_configs()
+    engine_config, build_config = _get_configs()
     
     engine_config.save()
     build_config.save()
     
-    print(f"Configuration saved to {USER_CONFIG_DIR}")
+    logger.info("Configuration saved to %s", USER_CONFIG_DIR)
     return True
 
 def _ensure_config_files_exist():
     """Ensure all configuration files exist in the user directory."""
-    for config_file in ['engine.ini', 'build.ini']:
-        source = os.path.join(CONFIG_FILES_DIR, config_file)
-        destination = os.path.join(USER_CONFIG_DIR, config_file)
-        
+    # One directory listing instead of an exists() probe per file
+    with os.scandir(USER_CONFIG_DIR) as entries:
+        existing = {entry.name for entry in entries}
+    
+    for config_file, source, destination in _CONFIG_FILES:
         # If the source file exists but destination doesn't, copy it
-        if os.path.exists(source) and not os.path.exists(destination):
+        if config_file not in existing and os.path.exists(source):
             shutil.copy2(source, destination)
-            print(f"Created default config file: {destination}")
-
-# Actually load the configs on the first import
-_import_configs()
+            logger.info("Created default config file: %s", destination)
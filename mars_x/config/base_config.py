@@ -3,17 +3,99 @@ Base configuration class that other configuration classes inherit from.
 """
 
 import os
-import configparser
+import re
 import shutil
+import logging
 from . import USER_CONFIG_DIR, CONFIG_FILES_DIR
 
+logger = logging.getLogger(__name__)
+
+# Sentinel distinguishing "option missing" from a stored value of None
+_MISSING = object()
+
+# Value types memoized by the typed getters
+_CACHE_KINDS = ('str', 'int', 'float', 'bool')
+
+# INI syntax: [section] headers, `key = value` or `key: value` options (split
+# at the first delimiter, as configparser does), and inline comments (at the
+# start of a value or preceded by whitespace)
+_SECTION_RE = re.compile(r'\[([^\]]+)\]')
+_OPTION_RE = re.compile(r'([^=:]+?)\s*[=:]\s*(.*)')
+_INLINE_COMMENT_RE = re.compile(r'(?:^|\s+)[;#].*$')
+
+# Accepted spellings for boolean values (same as configparser)
+_BOOLEAN_STATES = {
+    '1': True, 'yes': True, 'true': True, 'on': True,
+    '0': False, 'no': False, 'false': False, 'off': False,
+}
+
+def _to_bool(value):
+    """Convert a config string to a boolean."""
+    try:
+        return _BOOLEAN_STATES[value.lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {value}") from None
+
+def parse_ini(text):
+    """
+    Parse INI text into a {section: {option: value}} dict.
+    Lines indented deeper than an option continue its value, joined with
+    newlines as in configparser. Option names are lower-cased; full-line and
+    inline comments are stripped.
+    """
+    sections = {}
+    current = None
+    option = None     # Last option read, which deeper-indented lines continue
+    option_indent = 0
+    blank_lines = 0   # Blank lines inside a value, kept if a continuation follows
+    
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            blank_lines += 1
+            continue
+        if line[0] in '#;':
+            continue
+        
+        indent = len(raw_line) - len(raw_line.lstrip())
+        if option is not None and indent > option_indent:
+            current[option] += '\n' * (blank_lines + 1) + _INLINE_COMMENT_RE.sub('', line)
+            blank_lines = 0
+            continue
+        blank_lines = 0
+        
+        match = _SECTION_RE.fullmatch(line)
+        if match:
+            current = sections.setdefault(match.group(1).strip(), {})
+            option = None
+            continue
+        
+        match = _OPTION_RE.fullmatch(line)
+        if not match or current is None:
+            raise ValueError(f"Invalid config line: {line!r}")
+        
+        option = match.group(1).lower()
+        option_indent = indent
+        current[option] = _INLINE_COMMENT_RE.sub('', match.group(2))
+    
+    return sections
+
 class BaseConfig:
     """Base class for all configuration objects."""
     
     def __init__(self, config_name="config"):
         """Initialize configuration with specified name."""
         self.config_name = config_name
-        self.config = configparser.ConfigParser(comment_prefixes=('#', ';'))
+        self.config = {}  # {section: {option: value}}
+        
+        # Memoized (section, option, type) lookups, invalidated on set()/read()
+        self._cache = {}
+        
+        # path -> (mtime_ns, size) of the files read by the last load()
+        self._file_sigs = {}
+        
+        # Bumped on every change so subclasses can memoize derived values
+        self._mutation_counter = 0
         
         # Define file paths - look in multiple locations
         self.default_path = os.path.join(CONFIG_FILES_DIR, f"{config_name}.ini")
@@ -24,29 +106,39 @@ class BaseConfig:
         
     def load(self):
         """Load configuration from default and user files."""
-        loaded = False
-        
-        # First load defaults if they exist
-        if os.path.exists(self.default_path):
-            self.config.read(self.default_path)
-            loaded = True
-            print(f"Loaded default config from {self.default_path}")
-        
-        # Then check for local config file (useful during development)
-        if os.path.exists(self.local_path):
-            self.config.read(self.local_path)
-            loaded = True
-            print(f"Loaded local config from {self.local_path}")
-            
-        # Finally load user config, which has highest priority
-        if os.path.exists(self.user_path):
-            self.config.read(self.user_path)
-            loaded = True
-            print(f"Loaded user config from {self.user_path}")
+        # Files in increasing priority: defaults, a local config file
+        # (useful during development), then the user config
+        sources = (
+            ("default", self.default_path),
+            ("local", self.local_path),
+            ("user", self.user_path),
+        )
+        
+        # One stat() per file; (mtime, size) signatures detect changes
+        sigs = {}
+        for _, path in sources:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            sigs[path] = (st.st_mtime_ns, st.st_size)
+        
+        loaded = bool(sigs)
+        
+        # Re-read every file in priority order if any of them changed, so a
+        # changed lower-priority file cannot override a higher-priority one
+        if sigs != self._file_sigs:
+            for kind, path in sources:
+                if path in sigs:
+                    self.read(path)
+                    logger.debug("Loaded %s config from %s", kind, path)
+            self._file_sigs = sigs
+        
+        # Fill in any defaults the files did not provide
+        self._create_default_config()
         
         if not loaded:
-            print(f"No configuration files found for {self.config_name}. Creating defaults...")
-            self._create_default_config()
+            logger.info("No configuration files found for %s. Creating defaults...", self.config_name)
             self.save()
             
         return loaded
@@ -56,34 +148,79 @@ class BaseConfig:
         os.makedirs(os.path.dirname(self.user_path), exist_ok=True)
         
         with open(self.user_path, 'w') as f:
-            self.config.write(f)
+            for section, options in self.config.items():
+                f.write(f"[{section}]\n")
+                for option, value in options.items():
+                    # Indent continuation lines so multi-line values read back
+                    value = str(value).replace('\n', '\n\t')
+                    f.write(f"{option} = {value}\n")
+                f.write("\n")
             
         return True
     
+    def read(self, path):
+        """Merge settings from an INI file over the current configuration."""
+        with open(path, 'r') as f:
+            sections = parse_ini(f.read())
+        
+        for section, options in sections.items():
+            self.config.setdefault(section, {}).update(options)
+        
+        self._cache.clear()
+        self._mutation_counter += 1
+    
     def _create_default_config(self):
         """Create default configuration - to be overridden by subclasses."""
         pass
     
+    def _cached_lookup(self, convert, kind, section, option, fallback):
+        """Return a memoized lookup, converting the raw string on a miss."""
+        option = option.lower()
+        key = (section, option, kind)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        
+        try:
+            raw = self.config[section][option]
+        except KeyError:
+            # Don't cache fallbacks; different callers may pass different ones
+            return fallback
+        
+        value = self._cache[key] = convert(raw)
+        return value
+    
     def get(self, section, option, fallback=None):
         """Get a configuration value."""
-        return self.config.get(section, option, fallback=fallback)
+        return self._cached_lookup(str, 'str', section, option, fallback)
     
     def getint(self, section, option, fallback=None):
         """Get an integer configuration value."""
-        return self.config.getint(section, option, fallback=fallback)
+        return self._cached_lookup(int, 'int', section, option, fallback)
     
     def getfloat(self, section, option, fallback=None):
         """Get a float configuration value."""
-        return self.config.getfloat(section, option, fallback=fallback)
+        return self._cached_lookup(float, 'float', section, option, fallback)
     
     def getboolean(self, section, option, fallback=None):
         """Get a boolean configuration value."""
-        return self.config.getboolean(section, option, fallback=fallback)
+        return self._cached_lookup(_to_bool, 'bool', section, option, fallback)
     
     def set(self, section, option, value):
         """Set a configuration value."""
-        if not self.config.has_section(section):
-            self.config.add_section(section)
+        option = option.lower()
+        self.config.setdefault(section, {})[option] = str(value)
         
-        self.config.set(section, option, str(value))
+        # Drop every typed variant of this option from the lookup cache
+        for kind in _CACHE_KINDS:
+            self._cache.pop((section, option, kind), None)
+        self._mutation_counter += 1
         return True
+    
+    def set_if_missing(self, section, option, value):
+        """Set a configuration value only if it is not already present."""
+        if option.lower() in self.config.get(section, ()):
+            return False
+        
+        return self.set(section, option, value)
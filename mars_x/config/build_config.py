@@ -5,80 +5,96 @@ Build configuration settings for the Mars-X project.
 import os
 from .base_config import BaseConfig
 
+# Optimization level -> compiler flag, selected once for the current platform
+_WIN_OPT_FLAGS = {"O0": "/Od", "O1": "/O1", "O2": "/O2", "O3": "/Ox"}
+_UNIX_OPT_FLAGS = {"O0": "-O0", "O1": "-O1", "O2": "-O2", "O3": "-O3"}
+
+if os.name == 'nt':  # Windows
+    _OPT_FLAGS = _WIN_OPT_FLAGS
+    _DEBUG_FLAG = "/Zi"
+else:  # Unix-like
+    _OPT_FLAGS = _UNIX_OPT_FLAGS
+    _DEBUG_FLAG = "-g"
+
 class BuildConfig(BaseConfig):
     """Configuration for build settings."""
     
     def __init__(self):
         """Initialize build configuration."""
         super().__init__("build")
-        self._create_default_config()
+        
+        # (mutation counter, value) pairs for memoized derived settings
+        self._compiler_flags_cache = (None, None)
+        self._version_string_cache = (None, None)
         
     def _create_default_config(self):
         """Create default build configuration settings."""
         # Compiler settings
-        self.set("compiler", "optimization_level", "O2")
-        self.set("compiler", "debug_symbols", "False")
-        self.set("compiler", "additional_flags", "/favor:AMD64 /DWIN64" if os.name == 'nt' else "-march=native")
-        self.set("compiler", "parallel_jobs", "4")
+        self.set_if_missing("compiler", "optimization_level", "O2")
+        self.set_if_missing("compiler", "debug_symbols", "False")
+        self.set_if_missing("compiler", "additional_flags", "/favor:AMD64 /DWIN64" if os.name == 'nt' else "-march=native")
+        self.set_if_missing("compiler", "parallel_jobs", "4")
         
         # Packager settings
-        self.set("packager", "include_debug_files", "False")
-        self.set("packager", "create_installer", "True")
-        self.set("packager", "compression_level", "9")
-        self.set("packager", "onefile", "True")
+        self.set_if_missing("packager", "include_debug_files", "False")
+        self.set_if_missing("packager", "create_installer", "True")
+        self.set_if_missing("packager", "compression_level", "9")
+        self.set_if_missing("packager", "onefile", "True")
         
         # Asset settings
-        self.set("assets", "compress_textures", "True")
-        self.set("assets", "audio_quality", "medium")
-        self.set("assets", "bundle_assets", "True")
+        self.set_if_missing("assets", "compress_textures", "True")
+        self.set_if_missing("assets", "audio_quality", "medium")
+        self.set_if_missing("assets", "bundle_assets", "True")
         
         # Version settings
-        self.set("version", "major", "0")
-        self.set("version", "minor", "1")
-        self.set("version", "patch", "0")
-        self.set("version", "release_type", "alpha")
+        self.set_if_missing("version", "major", "0")
+        self.set_if_missing("version", "minor", "1")
+        self.set_if_missing("version", "patch", "0")
+        self.set_if_missing("version", "release_type", "alpha")
     
     def get_compiler_flags(self):
-        """Get compiler flags for current platform."""
+        """Get compiler flags for current platform, as a tuple."""
+        counter, cached = self._compiler_flags_cache
+        if counter == self._mutation_counter:
+            return cached
+        
         flags = []
         
         # Add optimization level
         opt_level = self.get("compiler", "optimization_level", "O2")
-        if os.name == 'nt':  # Windows
-            if opt_level == "O0":
-                flags.append("/Od")
-            elif opt_level == "O1":
-                flags.append("/O1")
-            elif opt_level == "O3":
-                flags.append("/Ox")
-            else:  # Default to O2
-                flags.append("/O2")
-                
-            # Add debug symbols if enabled
-            if self.getboolean("compiler", "debug_symbols", False):
-                flags.append("/Zi")
-        else:  # Unix-like
-            flags.append(f"-{opt_level}")
-            
-            # Add debug symbols if enabled
-            if self.getboolean("compiler", "debug_symbols", False):
-                flags.append("-g")
+        opt_flag = _OPT_FLAGS.get(opt_level)
+        if opt_flag is None:
+            # MSVC falls back to /O2; other compilers get the level verbatim (e.g. -Os)
+            opt_flag = "/O2" if os.name == 'nt' else f"-{opt_level}"
+        flags.append(opt_flag)
+        
+        # Add debug symbols if enabled
+        if self.getboolean("compiler", "debug_symbols", False):
+            flags.append(_DEBUG_FLAG)
         
         # Add additional user-defined flags
         additional = self.get("compiler", "additional_flags", "")
         if additional:
             flags.extend(additional.split())
         
+        flags = tuple(flags)
+        self._compiler_flags_cache = (self._mutation_counter, flags)
         return flags
     
     def get_version_string(self):
         """Get the current version string."""
+        counter, cached = self._version_string_cache
+        if counter == self._mutation_counter:
+            return cached
+        
         major = self.getint("version", "major", 0)
         minor = self.getint("version", "minor", 1)
         patch = self.getint("version", "patch", 0)
         release = self.get("version", "release_type", "alpha")
         
-        return f"{major}.{minor}.{patch}-{release}"
+        version = f"{major}.{minor}.{patch}-{release}"
+        self._version_string_cache = (self._mutation_counter, version)
+        return version
     
     def increment_patch_version(self):
         """Increment the patch version number."""
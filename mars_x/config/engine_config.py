@@ -11,37 +11,36 @@ class EngineConfig(BaseConfig):
     def __init__(self):
         """Initialize engine configuration."""
         super().__init__("engine")
-        self._create_default_config()
         
     def _create_default_config(self):
         """Create default configuration settings."""
         # Graphics settings
-        self.set("graphics", "resolution_width", "1280")
-        self.set("graphics", "resolution_height", "720")
-        self.set("graphics", "fullscreen", "False")
-        self.set("graphics", "vsync", "True")
-        self.set("graphics", "max_fps", "60")
+        self.set_if_missing("graphics", "resolution_width", "1280")
+        self.set_if_missing("graphics", "resolution_height", "720")
+        self.set_if_missing("graphics", "fullscreen", "False")
+        self.set_if_missing("graphics", "vsync", "True")
+        self.set_if_missing("graphics", "max_fps", "60")
         
         # Audio settings
-        self.set("audio", "master_volume", "0.8")
-        self.set("audio", "music_volume", "0.7")
-        self.set("audio", "sfx_volume", "1.0")
-        self.set("audio", "mute", "False")
+        self.set_if_missing("audio", "master_volume", "0.8")
+        self.set_if_missing("audio", "music_volume", "0.7")
+        self.set_if_missing("audio", "sfx_volume", "1.0")
+        self.set_if_missing("audio", "mute", "False")
         
         # Input settings
-        self.set("input", "mouse_sensitivity", "1.0")
-        self.set("input", "invert_y", "False")
-        self.set("input", "controller_enabled", "True")
+        self.set_if_missing("input", "mouse_sensitivity", "1.0")
+        self.set_if_missing("input", "invert_y", "False")
+        self.set_if_missing("input", "controller_enabled", "True")
         
         # Physics settings
-        self.set("physics", "timestep", "0.016")  # 60 fps
-        self.set("physics", "gravity", "9.81")
-        self.set("physics", "simulation_quality", "medium")
+        self.set_if_missing("physics", "timestep", "0.016")  # 60 fps
+        self.set_if_missing("physics", "gravity", "9.81")
+        self.set_if_missing("physics", "simulation_quality", "medium")
         
         # Debug settings
-        self.set("debug", "logging_level", "info")
-        self.set("debug", "show_fps", "False")
-        self.set("debug", "show_debug_info", "False")
+        self.set_if_missing("debug", "logging_level", "info")
+        self.set_if_missing("debug", "show_fps", "False")
+        self.set_if_missing("debug", "show_debug_info", "False")
     
     def get_resolution(self):
         """Get the current resolution as a tuple."""
@@ -3,29 +3,43 @@ Mars-X cython modules initialization.
 This file ensures proper importing of compiled Cython modules.
 """
 
+# Dict returned by get_modules(), populated on the first successful call
+_cached_modules = None
+
 # Don't import Cython modules at top level - this causes issues with PyInstaller
 # Instead, define a function to import them conditionally when needed
 def get_modules():
+    global _cached_modules
+    if _cached_modules is not None:
+        return _cached_modules
+    
     try:
         from .vector import Vector2, Vector3, Vector4
-        from .rigidbody import Entity, update_positions, apply_force, apply_torque
-        from .collision import detect_collision
+        from .rigidbody import Entity, update_positions, update_world, apply_force, apply_torque
+        from .collision import check_collision, resolve_collisions
         from .matrix import Matrix4
         from .quaternion import Quaternion
+        from .input_core import InputState
+        from .frame import render_frame
         
         print("Successfully loaded Cython modules.")
-        return {
+        _cached_modules = {
             'Vector2': Vector2,
             'Vector3': Vector3,
             'Vector4': Vector4,
             'Entity': Entity,
             'update_positions': update_positions,
+            'update_world': update_world,
             'apply_force': apply_force,
             'apply_torque': apply_torque,
-            'detect_collision': detect_collision,
+            'check_collision': check_collision,
+            'resolve_collisions': resolve_collisions,
             'Matrix4': Matrix4,
-            'Quaternion': Quaternion
+            'Quaternion': Quaternion,
+            'InputState': InputState,
+            'render_frame': render_frame
         }
+        return _cached_modules
     except ImportError as e:
         print(f"Error importing Cython modules: {e}")
         raise ImportError(
@@ -39,11 +53,15 @@ Vector3 = None
 Vector4 = None
 Entity = None
 update_positions = None
+update_world = None
 apply_force = None
 apply_torque = None
-detect_collision = None
+check_collision = None
+resolve_collisions = None
 Matrix4 = None
 Quaternion = None
+InputState = None
+render_frame = None
 
 # Import the modules immediately if not being analyzed by PyInstaller
 import sys
@@ -0,0 +1,4 @@
+# cython: language_level=3
+
+# Function declarations
+cpdef void render_frame(object renderer, object world) except *
@@ -0,0 +1,18 @@
+# cython: language_level=3
+
+import sdl2
+
+# SDL entry points, resolved once when the module is loaded
+cdef object _set_draw_color = sdl2.SDL_SetRenderDrawColor
+cdef object _render_clear = sdl2.SDL_RenderClear
+cdef object _render_present = sdl2.SDL_RenderPresent
+
+cpdef void render_frame(object renderer, object world) except *:
+    """
+    Clear to black, render the world and present in a single call from
+    the main loop, without returning to the interpreter between steps.
+    """
+    _set_draw_color(renderer, 0, 0, 0, 255)
+    _render_clear(renderer)
+    world.render()
+    _render_present(renderer)
@@ -0,0 +1,21 @@
+# cython: language_level=3
+
+# Table sizes for the fixed-size input state arrays
+cdef enum:
+    MAX_ACTIONS = 16
+    KEY_TABLE_SIZE = 1024
+
+cdef class InputState:
+    cdef bint just_pressed[MAX_ACTIONS]
+    cdef signed char sym_to_action[KEY_TABLE_SIZE]
+    cdef readonly int num_actions
+
+    cpdef void bind(self, int sym, int action_id)
+    cpdef void clear_bindings(self)
+    cpdef int press(self, int sym)
+    cpdef int release(self, int sym)
+    cpdef void clear_just_pressed(self)
+    cpdef bint is_just_pressed(self, int action_id)
+
+# Function declarations
+cdef int key_index(int sym) nogil
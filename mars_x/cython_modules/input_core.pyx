@@ -0,0 +1,96 @@
+# cython: language_level=3
+# cython: boundscheck=False
+# cython: wraparound=False
+
+from libc.string cimport memset
+
+# SDL marks keycodes without a printable character by OR-ing the scancode
+# with this bit (SDLK_SCANCODE_MASK)
+cdef int SCANCODE_MASK = 1 << 30
+cdef int KEY_TABLE_HALF = KEY_TABLE_SIZE // 2
+
+cdef int key_index(int sym) nogil:
+    """
+    Map an SDL keycode to a slot in the key lookup table.
+    Character keys use the lower half, scancode-based keys the upper half.
+    Returns -1 for keycodes that do not fit in the table.
+    """
+    cdef int scancode
+    
+    if 0 <= sym < KEY_TABLE_HALF:
+        return sym
+    
+    if sym & SCANCODE_MASK:
+        scancode = sym & ~SCANCODE_MASK
+        if 0 <= scancode < KEY_TABLE_HALF:
+            return KEY_TABLE_HALF + scancode
+    
+    return -1
+
+cdef class InputState:
+    """
+    Per-frame one-time action flags stored in a fixed-size C array indexed
+    by action ID. Key symbols are resolved to action IDs through a flat
+    lookup table.
+    """
+    def __cinit__(self, int num_actions=MAX_ACTIONS):
+        if num_actions < 0 or num_actions > MAX_ACTIONS:
+            raise ValueError(f"num_actions must be between 0 and {MAX_ACTIONS}")
+        
+        self.num_actions = num_actions
+        memset(self.just_pressed, 0, sizeof(self.just_pressed))
+        memset(self.sym_to_action, -1, sizeof(self.sym_to_action))
+    
+    cpdef void bind(self, int sym, int action_id):
+        """Map a key symbol to an action ID."""
+        cdef int index = key_index(sym)
+        
+        if index < 0:
+            raise ValueError(f"Key symbol {sym} cannot be bound")
+        if action_id < 0 or action_id >= self.num_actions:
+            raise IndexError(f"Action ID {action_id} out of range")
+        
+        self.sym_to_action[index] = <signed char>action_id
+    
+    cpdef void clear_bindings(self):
+        """Remove all key bindings."""
+        memset(self.sym_to_action, -1, sizeof(self.sym_to_action))
+    
+    cpdef int press(self, int sym):
+        """
+        Mark the action bound to a key symbol as just pressed.
+        Returns the action ID, or -1 if the key is unbound.
+        """
+        cdef int index = key_index(sym)
+        cdef int action_id
+        
+        if index < 0:
+            return -1
+        
+        action_id = self.sym_to_action[index]
+        if action_id >= 0:
+            self.just_pressed[action_id] = True
+        
+        return action_id
+    
+    cpdef int release(self, int sym):
+        """
+        Look up the action bound to a released key symbol.
+        Returns the action ID, or -1 if the key is unbound.
+        """
+        cdef int index = key_index(sym)
+        
+        if index < 0:
+            return -1
+        
+        return self.sym_to_action[index]
+    
+    cpdef void clear_just_pressed(self):
+        """Reset one-time action flags at the start of a frame."""
+        memset(self.just_pressed, 0, sizeof(self.just_pressed))
+    
+    cpdef bint is_just_pressed(self, int action_id):
+        """Check if an action was pressed this frame."""
+        if 0 <= action_id < self.num_actions:
+            return self.just_pressed[action_id]
+        return False
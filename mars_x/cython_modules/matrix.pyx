@@ -139,6 +139,7 @@ cdef class Matrix4:
             self.data[<int>M03] * cofactor03
         )
     
+    @cython.cdivision(True)  # det is checked against zero first
     cpdef Matrix4 inverse(self):
         """Calculate the inverse of this matrix"""
         cdef double det = self.determinant()
@@ -89,6 +89,7 @@ cdef class Quaternion:
         """Get the length (magnitude) of the quaternion"""
         return sqrt(self.x * self.x + self.y * self.y + self.z * self.z + self.w * self.w)
     
+    @cython.cdivision(True)  # len_val is checked against zero first
     cpdef Quaternion normalize(self):
         """Return a normalized quaternion (unit quaternion)"""
         cdef double len_val = self.length()
@@ -106,6 +107,7 @@ cdef class Quaternion:
         """Return the conjugate of this quaternion"""
         return Quaternion(-self.x, -self.y, -self.z, self.w)
     
+    @cython.cdivision(True)  # len_sq is checked against zero first
     cpdef Quaternion inverse(self):
         """Return the inverse of this quaternion"""
         cdef double len_sq = (
@@ -267,6 +269,7 @@ cdef class Quaternion:
         return Quaternion(x, y, z, w)
     
     @staticmethod
+    @cython.cdivision(True)  # sin_theta is checked against zero first
     cdef Quaternion slerp(Quaternion a, Quaternion b, double t):
         """Spherical linear interpolation between two quaternions"""
         # Clamp t to range [0, 1]
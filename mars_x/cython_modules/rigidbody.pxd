@@ -19,7 +19,11 @@ cdef class Entity:
     cdef public double radius
 
 # Function declarations
-cpdef void update_positions(list entities, double dt=*)
+cpdef void update_positions(float[:, ::1] pos, float[:, ::1] vel, unsigned char[::1] active,
+                            Py_ssize_t count, double dt=*)
+cpdef void update_world(float[:, ::1] pos, float[:, ::1] vel, float[::1] input_speed,
+                        unsigned char[::1] active, Py_ssize_t count, unsigned int mask,
+                        double dt=*)
 cpdef void apply_force(Entity entity, Vector2 force)
 cpdef void apply_torque(Entity entity, double torque)
 cdef Vector2D vec_normalize(Vector2D v) nogil
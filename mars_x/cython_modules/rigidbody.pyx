@@ -28,23 +28,86 @@ cdef class Entity:
         self.radius = 0.0
 
 @cython.cdivision(True)
-cpdef void update_positions(list entities, double dt=1/60.0):
+cpdef void update_positions(float[:, ::1] pos, float[:, ::1] vel, unsigned char[::1] active,
+                            Py_ssize_t count, double dt=1/60.0):
     """
-    Update positions of physics entities based on their velocities.
-    This is optimized with Cython for performance.
+    Update positions of the first `count` physics slots based on their velocities.
+    Operates on contiguous structure-of-arrays buffers ([x, y] and [vx, vy] rows).
     """
-    cdef int i
-    cdef Entity entity
+    cdef Py_ssize_t i
+    cdef float step, drag
     
-    for i in range(len(entities)):
-        entity = entities[i]
-        if entity.active:
-            entity.x += entity.vx * dt
-            entity.y += entity.vy * dt
+    with nogil:
+        for i in range(count):
+            # Inactive slots get a zero step and no drag instead of a branch,
+            # so the loop body is straight-line code the compiler can vectorize
+            step = (active[i] != 0) * dt
+            drag = 1.0 - (active[i] != 0) * 0.001
+            
+            pos[i, 0] += vel[i, 0] * step
+            pos[i, 1] += vel[i, 1] * step
+            
+            # Apply space drag (very minimal in space)
+            vel[i, 0] *= drag
+            vel[i, 1] *= drag
+
+# Movement bits of the input action mask (InputManager.snapshot()); these
+# follow the order of ACTIONS in mars_x.engine.input
+cdef enum:
+    MOVE_FORWARD_BIT = 1 << 0
+    MOVE_BACKWARD_BIT = 1 << 1
+    MOVE_LEFT_BIT = 1 << 2
+    MOVE_RIGHT_BIT = 1 << 3
+    MOVE_BITS = MOVE_FORWARD_BIT | MOVE_BACKWARD_BIT | MOVE_LEFT_BIT | MOVE_RIGHT_BIT
+
+# Unit movement direction [dx, dy] for each of the 16 combinations of the
+# movement bits; diagonals are normalized so they are not sqrt(2) faster
+cdef float MOVE_DIRECTIONS[MOVE_BITS + 1][2]
+
+@cython.cdivision(True)
+cdef void _init_move_directions():
+    cdef unsigned int bits
+    cdef float dx, dy, length
+    
+    for bits in range(MOVE_BITS + 1):
+        dx = ((bits & MOVE_RIGHT_BIT) != 0) - ((bits & MOVE_LEFT_BIT) != 0)
+        dy = ((bits & MOVE_BACKWARD_BIT) != 0) - ((bits & MOVE_FORWARD_BIT) != 0)
+        length = sqrt(dx * dx + dy * dy)
+        if length > 0:
+            dx /= length
+            dy /= length
+        MOVE_DIRECTIONS[bits][0] = dx
+        MOVE_DIRECTIONS[bits][1] = dy
+
+_init_move_directions()
+
+@cython.cdivision(True)
+cpdef void update_world(float[:, ::1] pos, float[:, ::1] vel, float[::1] input_speed,
+                        unsigned char[::1] active, Py_ssize_t count, unsigned int mask,
+                        double dt=1/60.0):
+    """
+    Advance the first `count` physics slots by one frame.
+    Slots with a non-zero input speed are moved by the WASD bits of `mask`,
+    then every active slot integrates its velocity as in update_positions.
+    """
+    cdef Py_ssize_t i
+    cdef float dx = MOVE_DIRECTIONS[mask & MOVE_BITS][0]
+    cdef float dy = MOVE_DIRECTIONS[mask & MOVE_BITS][1]
+    cdef float step, drag
+    
+    with nogil:
+        for i in range(count):
+            # Branch-free: inactive slots get a zero step and no drag, and
+            # slots not driven by input have an input speed of 0
+            step = (active[i] != 0) * dt
+            drag = 1.0 - (active[i] != 0) * 0.001
+            
+            pos[i, 0] += (dx * input_speed[i] + vel[i, 0]) * step
+            pos[i, 1] += (dy * input_speed[i] + vel[i, 1]) * step
             
             # Apply space drag (very minimal in space)
-            entity.vx *= 0.999
-            entity.vy *= 0.999
+            vel[i, 0] *= drag
+            vel[i, 1] *= drag
 
 @cython.cdivision(True)
 cdef Vector2D vec_normalize(Vector2D v) nogil:
@@ -1,10 +1,10 @@
 # cython: language_level=3
 
-# Fast math functions - simplified exception handling
-cdef double fast_invsqrt(double x) nogil
-cdef double fast_sqrt(double x) nogil
-cdef double fast_sin(double x) nogil
-cdef double fast_cos(double x) nogil
+# Fast math functions - noexcept, so cimporting modules skip the error check
+cdef double fast_invsqrt(double x) noexcept nogil
+cdef double fast_sqrt(double x) noexcept nogil
+cdef double fast_sin(double x) noexcept nogil
+cdef double fast_cos(double x) noexcept nogil
 
 # Define Vector structs - renamed to Vec to avoid conflicts with classes
 cdef struct Vec2:
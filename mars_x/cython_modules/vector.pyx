@@ -10,7 +10,7 @@ from libc.string cimport memcpy
 
 # Fast inverse square root using the classic Quake III algorithm
 @cython.cdivision(True)
-cdef double fast_invsqrt(double x) nogil:
+cdef double fast_invsqrt(double x) noexcept nogil:
     """Fast inverse square root using the Quake III algorithm with bit manipulation."""
     if x <= 0:
         return 0.0
@@ -34,7 +34,7 @@ cdef double fast_invsqrt(double x) nogil:
 
 # Fast approximation of sqrt(x) using the inverse square root
 @cython.cdivision(True)
-cdef double fast_sqrt(double x) nogil:
+cdef double fast_sqrt(double x) noexcept nogil:
     """Fast square root approximation using inverse square root."""
     if x <= 0:
         return 0.0
@@ -42,7 +42,7 @@ cdef double fast_sqrt(double x) nogil:
 
 # Fast approximation for sine function - uses Taylor series approximation
 @cython.cdivision(True)
-cdef double fast_sin(double x) nogil:
+cdef double fast_sin(double x) noexcept nogil:
     """Fast sine approximation using polynomial."""
     # Normalize angle to [-pi, pi]
     cdef double two_pi = 2.0 * M_PI
@@ -58,7 +58,7 @@ cdef double fast_sin(double x) nogil:
 
 # Fast approximation for cosine function - uses Taylor series approximation
 @cython.cdivision(True)
-cdef double fast_cos(double x) nogil:
+cdef double fast_cos(double x) noexcept nogil:
     """Fast cosine approximation using polynomial."""
     # cos(x) = sin(x + pi/2)
     return fast_sin(x + M_PI/2.0)
@@ -0,0 +1,57 @@
+"""
+Batched pipeline barriers for Vulkan command buffers.
+"""
+import vulkan as vk
+
+class BarrierBatch:
+    """
+    Collects memory, buffer and image barriers and records them with a
+    single vkCmdPipelineBarrier call when flushed.
+    
+    Stage masks of the queued barriers are OR-combined, so a batch should
+    only hold barriers belonging to the same stage transition.
+    """
+    
+    def __init__(self):
+        self.memory_barriers = []
+        self.buffer_barriers = []
+        self.image_barriers = []
+        self.src_stage_mask = 0
+        self.dst_stage_mask = 0
+    
+    def add_memory(self, barrier, src_stage, dst_stage):
+        """Queue a VkMemoryBarrier."""
+        self.memory_barriers.append(barrier)
+        self.src_stage_mask |= src_stage
+        self.dst_stage_mask |= dst_stage
+    
+    def add_buffer(self, barrier, src_stage, dst_stage):
+        """Queue a VkBufferMemoryBarrier."""
+        self.buffer_barriers.append(barrier)
+        self.src_stage_mask |= src_stage
+        self.dst_stage_mask |= dst_stage
+    
+    def add_image(self, barrier, src_stage, dst_stage):
+        """Queue a VkImageMemoryBarrier."""
+        self.image_barriers.append(barrier)
+        self.src_stage_mask |= src_stage
+        self.dst_stage_mask |= dst_stage
+    
+    def flush(self, command_buffer):
+        """Record all queued barriers into command_buffer and reset the batch."""
+        memory, buffers, images = self.memory_barriers, self.buffer_barriers, self.image_barriers
+        if not (memory or buffers or images):
+            return
+        
+        vk.vkCmdPipelineBarrier(
+            command_buffer, self.src_stage_mask, self.dst_stage_mask, 0,
+            len(memory), memory or None,
+            len(buffers), buffers or None,
+            len(images), images or None,
+        )
+        
+        memory.clear()
+        buffers.clear()
+        images.clear()
+        self.src_stage_mask = 0
+        self.dst_stage_mask = 0
@@ -1,26 +1,58 @@
+import ctypes
 import sdl2
 import logging
 
+# Import the Cython input state module - no fallbacks
+from mars_x.cython_modules.input_core import InputState  # type: ignore
+
+# Game actions, in action-ID order - remove arrow key movements for simplicity
+ACTIONS = (
+    'move_forward',       # W key
+    'move_backward',      # S key
+    'move_left',          # A key
+    'move_right',         # D key
+    'jump',
+    'fire',
+    'toggle_fullscreen',
+    'open_settings',      # Add a new action for opening settings
+    'quit',
+)
+
+# Continuous movement actions reported in debug output
+_MOVE_ACTIONS = ('move_forward', 'move_backward', 'move_left', 'move_right')
+
+# Bits of the packed action mask returned by InputManager.snapshot()
+# (bit N is set while the action with ID N is active)
+MOVE_FORWARD_BIT = 1 << ACTIONS.index('move_forward')
+MOVE_BACKWARD_BIT = 1 << ACTIONS.index('move_backward')
+MOVE_LEFT_BIT = 1 << ACTIONS.index('move_left')
+MOVE_RIGHT_BIT = 1 << ACTIONS.index('move_right')
+
+class ActionState:
+    """Continuous on/off state of every game action, one slot per action."""
+    __slots__ = ACTIONS
+    
+    def __init__(self):
+        for action in ACTIONS:
+            setattr(self, action, False)
+
 class InputManager:
     def __init__(self):
-        self.event = sdl2.SDL_Event()
+        # SDL owns this array and updates it in place while pumping events,
+        # so the pointer only needs to be fetched once
         self.keys = sdl2.SDL_GetKeyboardState(None)
         self.mouse_x = 0
         self.mouse_y = 0
         self.mouse_buttons = {}
         
-        # Add handling for game actions - remove arrow key movements for simplicity
-        self.actions = {
-            'move_forward': False,  # W key
-            'move_backward': False, # S key
-            'move_left': False,     # A key
-            'move_right': False,    # D key
-            'jump': False,
-            'fire': False,
-            'toggle_fullscreen': False,
-            'open_settings': False, # Add a new action for opening settings
-            'quit': False
-        }
+        # Continuous action state, read as attributes (e.g. actions.move_forward)
+        # and packed into a bitmask for snapshot()
+        self.actions = ActionState()
+        self._action_mask = 0
+        
+        # One-time action flags live in a fixed-size C array indexed by action ID
+        self.action_ids = {action: i for i, action in enumerate(ACTIONS)}
+        self._state = InputState(len(ACTIONS))
         
         # Key mappings for game actions - remove arrow key mappings
         self.key_mappings = {
@@ -35,82 +67,135 @@ class InputManager:
             'quit': None  # Remove the direct key mapping for quit
         }
         
-        # Track which keys were just pressed this frame (for one-time actions)
-        self.key_just_pressed = {action: False for action in self.actions}
+        # Key symbol -> action ID table, rebuilt whenever mappings change
+        self._update_key_bindings()
+        
+        # Event type -> handler jump table used by process_input
+        self._debug = False
+        self._event_handlers = {
+            sdl2.SDL_MOUSEMOTION: self._on_mouse_motion,
+            sdl2.SDL_MOUSEBUTTONDOWN: self._on_mouse_down,
+            sdl2.SDL_MOUSEBUTTONUP: self._on_mouse_up,
+            sdl2.SDL_KEYDOWN: self._on_keydown,
+            sdl2.SDL_KEYUP: self._on_keyup,
+            sdl2.SDL_WINDOWEVENT: self._on_window,
+            sdl2.SDL_QUIT: self._on_quit,
+        }
     
-    def process_input(self):
-        """Process all pending SDL events and update input state."""
-        quit_requested = False
+    def _update_key_bindings(self):
+        """Rebuild the key symbol -> action ID table from key_mappings."""
+        self._state.clear_bindings()
+        for action, sym in self.key_mappings.items():
+            if sym is not None:
+                self._state.bind(sym, self.action_ids[action])
+    
+    def set_key_mapping(self, action, sym):
+        """Map a game action to a key symbol (None removes the mapping)."""
+        if action not in self.action_ids:
+            raise KeyError(f"Unknown action: {action}")
         
-        # Reset one-time actions
-        for action in self.key_just_pressed:
-            self.key_just_pressed[action] = False
+        self.key_mappings[action] = sym
+        self._update_key_bindings()
+    
+    def process_input(self, _poll=sdl2.SDL_PollEvent, _new_event=sdl2.SDL_Event,
+                      _byref=ctypes.byref):
+        """
+        Process all pending SDL events and update input state.
+        The underscored defaults pre-bind SDL symbols as fast locals; callers
+        should not pass them.
+        """
+        self._debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        get_handler = self._event_handlers.get
         
-        while sdl2.SDL_PollEvent(self.event):
-            # Update mouse position
-            if self.event.type in (sdl2.SDL_MOUSEMOTION, sdl2.SDL_MOUSEBUTTONDOWN, sdl2.SDL_MOUSEBUTTONUP):
-                self.mouse_x = self.event.motion.x
-                self.mouse_y = self.event.motion.y
-                logging.debug(f"Mouse position: ({self.mouse_x}, {self.mouse_y})")
-            
-            # Handle window events
-            if self.event.type == sdl2.SDL_WINDOWEVENT:
-                if self.event.window.event == sdl2.SDL_WINDOWEVENT_RESIZED:
-                    logging.info(f"Window resized to {self.event.window.data1}x{self.event.window.data2}")
-            
-            # Update mouse button state
-            if self.event.type == sdl2.SDL_MOUSEBUTTONDOWN:
-                self.mouse_buttons[self.event.button.button] = True
-                logging.debug(f"Mouse button {self.event.button.button} pressed")
-            elif self.event.type == sdl2.SDL_MOUSEBUTTONUP:
-                self.mouse_buttons[self.event.button.button] = False
-                logging.debug(f"Mouse button {self.event.button.button} released")
-                
-            # Process key presses and update action states
-            if self.event.type == sdl2.SDL_KEYDOWN:
-                key = self.event.key.keysym.sym
-                logging.debug(f"Key pressed: {key}")
-                
-                for action, mapped_key in self.key_mappings.items():
-                    if key == mapped_key:
-                        # For continuous actions
-                        self.actions[action] = True
-                        
-                        # For one-time actions (like toggling fullscreen)
-                        self.key_just_pressed[action] = True
-                        
-                        logging.debug(f"Action '{action}' activated")
-                
-            # Process key releases
-            elif self.event.type == sdl2.SDL_KEYUP:
-                key = self.event.key.keysym.sym
-                logging.debug(f"Key released: {key}")
-                
-                for action, mapped_key in self.key_mappings.items():
-                    if key == mapped_key:
-                        self.actions[action] = False
-                        logging.debug(f"Action '{action}' deactivated")
-            
-            # Handle window close event (X button)
-            if self.event.type == sdl2.SDL_QUIT:
-                self.actions['quit'] = True
-                quit_requested = True
-                logging.debug("Quit requested via window close")
+        # Fresh per-call event buffer; handlers receive it explicitly rather
+        # than reading a shared instance attribute
+        event = _new_event()
+        event_ref = _byref(event)
         
-        # Update keyboard state
-        self.keys = sdl2.SDL_GetKeyboardState(None)
+        # Reset one-time actions
+        self._state.clear_just_pressed()
+        
+        while _poll(event_ref):
+            # Dispatch on event type; unhandled event types are ignored
+            handler = get_handler(event.type)
+            if handler is not None:
+                handler(event)
         
         # Check if quit was requested by any method - now only window close triggers this
-        if self.actions['quit']:
-            quit_requested = True
+        quit_requested = self.actions.quit
             
         # Log active movement actions for debugging
-        active_moves = [a for a in ['move_forward', 'move_backward', 'move_left', 'move_right'] if self.actions[a]]
-        if active_moves:
-            logging.debug(f"Movement actions: {', '.join(active_moves)}")
+        if self._debug:
+            active_moves = [a for a in _MOVE_ACTIONS if getattr(self.actions, a)]
+            if active_moves:
+                logging.debug("Movement actions: %s", ', '.join(active_moves))
             
         return quit_requested
     
+    def _on_mouse_motion(self, event):
+        """Update mouse position from a motion event."""
+        self.mouse_x = event.motion.x
+        self.mouse_y = event.motion.y
+        if self._debug:
+            logging.debug("Mouse position: (%d, %d)", self.mouse_x, self.mouse_y)
+    
+    def _on_mouse_down(self, event):
+        """Update mouse position and mark a button as pressed."""
+        self.mouse_x = event.button.x
+        self.mouse_y = event.button.y
+        self.mouse_buttons[event.button.button] = True
+        if self._debug:
+            logging.debug("Mouse button %d pressed", event.button.button)
+    
+    def _on_mouse_up(self, event):
+        """Update mouse position and mark a button as released."""
+        self.mouse_x = event.button.x
+        self.mouse_y = event.button.y
+        self.mouse_buttons[event.button.button] = False
+        if self._debug:
+            logging.debug("Mouse button %d released", event.button.button)
+    
+    def _on_keydown(self, event):
+        """Activate the action mapped to a pressed key."""
+        key = event.key.keysym.sym
+        
+        # Also marks the action as just pressed (for one-time actions)
+        action_id = self._state.press(key)
+        if action_id >= 0:
+            # For continuous actions
+            setattr(self.actions, ACTIONS[action_id], True)
+            self._action_mask |= 1 << action_id
+        
+        if self._debug:
+            logging.debug("Key pressed: %d", key)
+            if action_id >= 0:
+                logging.debug("Action '%s' activated", ACTIONS[action_id])
+    
+    def _on_keyup(self, event):
+        """Deactivate the action mapped to a released key."""
+        key = event.key.keysym.sym
+        action_id = self._state.release(key)
+        if action_id >= 0:
+            setattr(self.actions, ACTIONS[action_id], False)
+            self._action_mask &= ~(1 << action_id)
+        
+        if self._debug:
+            logging.debug("Key released: %d", key)
+            if action_id >= 0:
+                logging.debug("Action '%s' deactivated", ACTIONS[action_id])
+    
+    def _on_window(self, event):
+        """Handle window events."""
+        if event.window.event == sdl2.SDL_WINDOWEVENT_RESIZED:
+            logging.info("Window resized to %dx%d", event.window.data1, event.window.data2)
+    
+    def _on_quit(self, event):
+        """Handle the window close event (X button)."""
+        self.actions.quit = True
+        self._action_mask |= 1 << self.action_ids['quit']
+        if self._debug:
+            logging.debug("Quit requested via window close")
+    
     def is_key_pressed(self, key):
         """Check if a key is currently pressed."""
         return self.keys[key]
@@ -123,14 +208,28 @@ class InputManager:
         """Get the current mouse position."""
         return (self.mouse_x, self.mouse_y)
     
+    def snapshot(self):
+        """Get the active actions packed into an int (bit N = action ID N)."""
+        return self._action_mask
+    
     def is_action_active(self, action):
         """Check if a game action is currently active."""
-        return self.actions.get(action, False)
+        return getattr(self.actions, action, False)
     
     def is_action_just_pressed(self, action):
         """Check if a game action was just pressed this frame (for one-time actions)."""
-        return self.key_just_pressed.get(action, False)
+        action_id = self.action_ids.get(action)
+        return action_id is not None and self._state.is_just_pressed(action_id)
+    
+    def resolve_action(self, action):
+        """Get the stable integer ID of an action, for per-frame checks by ID."""
+        return self.action_ids[action]
+    
+    def is_action_id_just_pressed(self, action_id):
+        """Like is_action_just_pressed, for an ID from resolve_action()."""
+        return self._state.is_just_pressed(action_id)
     
     def get_active_actions(self):
         """Get a dictionary of all active actions."""
-        return {action: state for action, state in self.actions.items() if state}
+        actions = self.actions
+        return {action: True for action in ActionState.__slots__ if getattr(actions, action)}
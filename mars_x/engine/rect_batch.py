@@ -0,0 +1,59 @@
+"""
+Batched filled-rectangle drawing for the SDL renderer.
+"""
+import sdl2
+
+class RectBatch:
+    """
+    Collects filled rectangles per color and submits each color group with
+    a single SDL_RenderFillRects call when flushed.
+    """
+    
+    def __init__(self, sdl_renderer, initial_capacity=64):
+        self.sdl_renderer = sdl_renderer
+        self.initial_capacity = initial_capacity
+        
+        # (r, g, b, a) -> [SDL_Rect array, count]; arrays are kept between frames
+        self._rect_batches = {}
+        
+        # Filled in and copied into the arrays, so queuing a rect does not
+        # create a new SDL_Rect object
+        self._scratch_rect = sdl2.SDL_Rect(0, 0, 0, 0)
+    
+    def draw_rect(self, x, y, width, height, color):
+        """Queue a filled rectangle (top-left corner, size) in the given RGBA color."""
+        batch = self._rect_batches.get(color)
+        if batch is None:
+            batch = self._rect_batches[color] = [(sdl2.SDL_Rect * self.initial_capacity)(), 0]
+        
+        rects, count = batch
+        if count == len(rects):
+            # Double the capacity, keeping the rects queued so far
+            grown = (sdl2.SDL_Rect * (count * 2))()
+            grown[:count] = rects
+            batch[0] = rects = grown
+        
+        # Reading rects[count] would build a new SDL_Rect proxy each call;
+        # assigning into the array just copies the scratch rect's bytes
+        rect = self._scratch_rect
+        rect.x = int(x)
+        rect.y = int(y)
+        rect.w = int(width)
+        rect.h = int(height)
+        rects[count] = rect
+        batch[1] = count + 1
+    
+    def flush(self, _set_color=sdl2.SDL_SetRenderDrawColor, _fill_rects=sdl2.SDL_RenderFillRects):
+        """Submit all queued rectangles, one draw call per color.
+        
+        pysdl2 binds these as plain CDLL function pointers, so ctypes releases
+        the GIL for the duration of each call and other threads (e.g. the
+        nogil physics kernels) can run while SDL fills a large batch.
+        """
+        renderer = self.sdl_renderer
+        for (r, g, b, a), batch in self._rect_batches.items():
+            rects, count = batch
+            if count:
+                _set_color(renderer, r, g, b, a)
+                _fill_rects(renderer, rects, count)
+                batch[1] = 0
@@ -1,13 +1,123 @@
+import contextlib
+import threading
 import vulkan as vk
 from mars_x.engine.window import Window
+from mars_x.engine.barrier_batch import BarrierBatch
+from mars_x.engine.texture_upload import TextureUploader
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Instance extensions requested on top of the ones SDL needs for the window
+_BASE_EXTENSIONS = (vk.VK_EXT_DEBUG_UTILS_EXTENSION_NAME,)
+
+# Device extensions required to present to the window surface
+_DEVICE_EXTENSIONS = (vk.VK_KHR_SWAPCHAIN_EXTENSION_NAME,)
+
+# Swapchain image count requested for mailbox presentation (triple buffering)
+_LOW_LATENCY_IMAGE_COUNT = 3
+
+# How long end_frame waits for the presentation engine to hand over an image
+_ACQUIRE_TIMEOUT_NS = 1_000_000_000
+_UINT64_MAX = 0xFFFFFFFFFFFFFFFF
+
+# Number of frames the CPU may record ahead of the GPU
+FRAMES_IN_FLIGHT = 3
+
+_COLOR_SUBRESOURCE_RANGE = vk.VkImageSubresourceRange(
+    aspectMask=vk.VK_IMAGE_ASPECT_COLOR_BIT,
+    baseMipLevel=0,
+    levelCount=1,
+    baseArrayLayer=0,
+    layerCount=1,
+)
+
+# Frame command buffers are reset every frame and submitted exactly once
+_ONE_TIME_BEGIN_INFO = vk.VkCommandBufferBeginInfo(
+    flags=vk.VK_COMMAND_BUFFER_USAGE_ONE_TIME_SUBMIT_BIT,
+)
+
+def _find_dedicated_family(families, wanted, excluded):
+    """Index of the first queue family with `wanted` and none of `excluded` flags."""
+    for index, family in enumerate(families):
+        if family.queueFlags & wanted and not family.queueFlags & excluded:
+            return index
+    return None
+
+class FrameResources:
+    """Command buffers and sync objects owned by one frame in flight.
+    
+    Each frame has its own command pool so the whole pool can be reset once
+    the frame's fence signals, instead of resetting buffers one by one.
+    """
+    
+    def __init__(self, device, queue_family):
+        pool_create_info = vk.VkCommandPoolCreateInfo(
+            flags=vk.VK_COMMAND_POOL_CREATE_TRANSIENT_BIT,
+            queueFamilyIndex=queue_family,
+        )
+        self.command_pool = vk.vkCreateCommandPool(device, pool_create_info, None)
+        
+        # init (uploads), main (scene) and present (recorded after late acquire)
+        alloc_info = vk.VkCommandBufferAllocateInfo(
+            commandPool=self.command_pool,
+            level=vk.VK_COMMAND_BUFFER_LEVEL_PRIMARY,
+            commandBufferCount=3,
+        )
+        self.init_cb, self.main_cb, self.present_cb = vk.vkAllocateCommandBuffers(device, alloc_info)
+        
+        semaphore_create_info = vk.VkSemaphoreCreateInfo()
+        self.image_available_sem = vk.vkCreateSemaphore(device, semaphore_create_info, None)
+        self.render_finished_sem = vk.vkCreateSemaphore(device, semaphore_create_info, None)
+        
+        # Created signaled so the first wait on this frame does not block
+        fence_create_info = vk.VkFenceCreateInfo(flags=vk.VK_FENCE_CREATE_SIGNALED_BIT)
+        self.fence = vk.vkCreateFence(device, fence_create_info, None)
+    
+    def destroy(self, device):
+        vk.vkDestroyFence(device, self.fence, None)
+        vk.vkDestroySemaphore(device, self.render_finished_sem, None)
+        vk.vkDestroySemaphore(device, self.image_available_sem, None)
+        # Destroying the pool frees its command buffers
+        vk.vkDestroyCommandPool(device, self.command_pool, None)
 
 class VulkanRenderer:
     def __init__(self, window):
         self.window = window
         self.instance = None
+        self.physical_device = None
         self.device = None
+        self.graphics_queue_family = None
+        self.graphics_queue = None
+        # Dedicated queues where the device has them, else the graphics queue
+        self.transfer_queue_family = None
+        self.transfer_queue = None
+        self.compute_queue_family = None
+        self.compute_queue = None
+        # Queues on the graphics family; above 1, uploads get their own queue
+        self._graphics_queue_count = 1
+        # Guards graphics queue submits if the upload thread shares the queue
+        self._queue_lock = contextlib.nullcontext()
+        self._uploader = None
         self.surface = None
         self.swap_chain = None
+        self.swap_chain_images = ()
+        self.swap_chain_format = None
+        self.swap_chain_extent = None
+        self.present_mode = None
+        self.clear_color = (0.0, 0.0, 0.0, 1.0)
+        
+        # Ring of per-frame resources; _frame is the one being recorded
+        self._frames = []
+        self._frame_idx = 0
+        self._frame = None
+        
+        # Command buffers going out with this frame's single vkQueueSubmit
+        self._pending_cbs = []
+        
+        # Barriers are queued here and recorded once per stage transition
+        self.barriers = BarrierBatch()
         
         self._initialize_vulkan()
     
@@ -22,8 +132,7 @@ class VulkanRenderer:
         )
         
         # Get required extensions
-        extensions = self.window.get_vulkan_instance_extensions()
-        extensions.append(vk.VK_EXT_DEBUG_UTILS_EXTENSION_NAME)
+        extensions = self.window.get_vulkan_instance_extensions() + _BASE_EXTENSIONS
         
         # Create instance
         instance_create_info = vk.VkInstanceCreateInfo(
@@ -37,28 +146,333 @@ class VulkanRenderer:
         # Create surface
         self.surface = self.window.create_vulkan_surface(self.instance)
         
-        # TODO: Select physical device, create logical device, swap chain, etc.
-        # This is a basic skeleton, a real implementation would require more setup
+        # Surface/swapchain entry points are extensions and must be looked up
+        self._vkGetPhysicalDeviceSurfaceSupportKHR = vk.vkGetInstanceProcAddr(
+            self.instance, 'vkGetPhysicalDeviceSurfaceSupportKHR')
+        self._vkGetPhysicalDeviceSurfaceCapabilitiesKHR = vk.vkGetInstanceProcAddr(
+            self.instance, 'vkGetPhysicalDeviceSurfaceCapabilitiesKHR')
+        self._vkGetPhysicalDeviceSurfaceFormatsKHR = vk.vkGetInstanceProcAddr(
+            self.instance, 'vkGetPhysicalDeviceSurfaceFormatsKHR')
+        self._vkGetPhysicalDeviceSurfacePresentModesKHR = vk.vkGetInstanceProcAddr(
+            self.instance, 'vkGetPhysicalDeviceSurfacePresentModesKHR')
+        self._vkDestroySurfaceKHR = vk.vkGetInstanceProcAddr(
+            self.instance, 'vkDestroySurfaceKHR')
+        
+        self._select_physical_device()
+        self._create_logical_device()
+        self._create_swap_chain()
+        self._create_frame_resources()
+        
+        self._uploader = TextureUploader(
+            self.device, self.physical_device, self.transfer_queue,
+            self.transfer_queue_family, self.graphics_queue_family, self._queue_lock)
+    
+    def _select_physical_device(self):
+        """Pick the first GPU with a queue family that can draw and present.
+        
+        Also picks transfer-only and compute-only queue families so uploads
+        and compute work can be submitted in parallel with rendering.
+        """
+        for physical_device in vk.vkEnumeratePhysicalDevices(self.instance):
+            families = vk.vkGetPhysicalDeviceQueueFamilyProperties(physical_device)
+            for index, family in enumerate(families):
+                if not family.queueFlags & vk.VK_QUEUE_GRAPHICS_BIT:
+                    continue
+                if self._vkGetPhysicalDeviceSurfaceSupportKHR(physical_device, index, self.surface):
+                    self.physical_device = physical_device
+                    self.graphics_queue_family = index
+                    self._graphics_queue_count = family.queueCount
+                    
+                    transfer = _find_dedicated_family(
+                        families, vk.VK_QUEUE_TRANSFER_BIT, vk.VK_QUEUE_GRAPHICS_BIT | vk.VK_QUEUE_COMPUTE_BIT)
+                    compute = _find_dedicated_family(
+                        families, vk.VK_QUEUE_COMPUTE_BIT, vk.VK_QUEUE_GRAPHICS_BIT)
+                    self.transfer_queue_family = index if transfer is None else transfer
+                    self.compute_queue_family = index if compute is None else compute
+                    return
+        
+        raise RuntimeError("No Vulkan device can present to the window surface")
+    
+    def _create_logical_device(self):
+        """Create the logical device with one queue from each selected family.
+        
+        Without a dedicated transfer family, uploads take a second graphics
+        family queue if there is one, else share the graphics queue under a lock.
+        """
+        families = sorted({self.graphics_queue_family, self.transfer_queue_family, self.compute_queue_family})
+        transfer_index = 0
+        if self.transfer_queue_family == self.graphics_queue_family:
+            if self._graphics_queue_count > 1:
+                transfer_index = 1
+            else:
+                self._queue_lock = threading.Lock()
+        queue_create_infos = []
+        for family in families:
+            count = transfer_index + 1 if family == self.transfer_queue_family else 1
+            queue_create_infos.append(vk.VkDeviceQueueCreateInfo(
+                queueFamilyIndex=family,
+                queueCount=count,
+                pQueuePriorities=[1.0] * count,
+            ))
+        
+        device_create_info = vk.VkDeviceCreateInfo(
+            queueCreateInfoCount=len(queue_create_infos),
+            pQueueCreateInfos=queue_create_infos,
+            enabledExtensionCount=len(_DEVICE_EXTENSIONS),
+            ppEnabledExtensionNames=_DEVICE_EXTENSIONS,
+        )
+        
+        self.device = vk.vkCreateDevice(self.physical_device, device_create_info, None)
+        self.graphics_queue = vk.vkGetDeviceQueue(self.device, self.graphics_queue_family, 0)
+        self.transfer_queue = vk.vkGetDeviceQueue(self.device, self.transfer_queue_family, transfer_index)
+        self.compute_queue = vk.vkGetDeviceQueue(self.device, self.compute_queue_family, 0)
+        
+        self._vkCreateSwapchainKHR = vk.vkGetDeviceProcAddr(self.device, 'vkCreateSwapchainKHR')
+        self._vkDestroySwapchainKHR = vk.vkGetDeviceProcAddr(self.device, 'vkDestroySwapchainKHR')
+        self._vkGetSwapchainImagesKHR = vk.vkGetDeviceProcAddr(self.device, 'vkGetSwapchainImagesKHR')
+        self._vkAcquireNextImageKHR = vk.vkGetDeviceProcAddr(self.device, 'vkAcquireNextImageKHR')
+        # Caller-owned out-parameter, so the index survives VkSuboptimalKhr
+        self._image_index = vk.ffi.new('uint32_t*')
+        self._vkQueuePresentKHR = vk.vkGetDeviceProcAddr(self.device, 'vkQueuePresentKHR')
+    
+    def _choose_present_mode(self):
+        """Prefer mailbox (triple buffering) unless the window asks for plain vsync.
+        
+        FIFO is the only mode the spec guarantees, so it is always the fallback.
+        """
+        if self.window.prefer_low_latency:
+            modes = self._vkGetPhysicalDeviceSurfacePresentModesKHR(self.physical_device, self.surface)
+            if vk.VK_PRESENT_MODE_MAILBOX_KHR in modes:
+                return vk.VK_PRESENT_MODE_MAILBOX_KHR
+        return vk.VK_PRESENT_MODE_FIFO_KHR
+    
+    def _create_swap_chain(self):
+        """Create the swapchain for the window surface."""
+        caps = self._vkGetPhysicalDeviceSurfaceCapabilitiesKHR(self.physical_device, self.surface)
+        surface_format = self._vkGetPhysicalDeviceSurfaceFormatsKHR(self.physical_device, self.surface)[0]
+        self.present_mode = self._choose_present_mode()
+        
+        # Mailbox needs a third image so the CPU can keep submitting while one
+        # image is on screen and another is queued; FIFO keeps double buffering
+        image_count = caps.minImageCount
+        if self.present_mode == vk.VK_PRESENT_MODE_MAILBOX_KHR:
+            image_count = max(image_count, _LOW_LATENCY_IMAGE_COUNT)
+        if caps.maxImageCount:  # 0 means no upper limit
+            image_count = min(image_count, caps.maxImageCount)
+        
+        # An extent of 0xFFFFFFFF means the surface size follows the swapchain
+        if caps.currentExtent.width == 0xFFFFFFFF:
+            width, height = self.window.get_size()
+            extent = vk.VkExtent2D(width=width, height=height)
+        else:
+            extent = caps.currentExtent
+        
+        swap_chain_create_info = vk.VkSwapchainCreateInfoKHR(
+            surface=self.surface,
+            minImageCount=image_count,
+            imageFormat=surface_format.format,
+            imageColorSpace=surface_format.colorSpace,
+            imageExtent=extent,
+            imageArrayLayers=1,
+            imageUsage=vk.VK_IMAGE_USAGE_COLOR_ATTACHMENT_BIT | vk.VK_IMAGE_USAGE_TRANSFER_DST_BIT,
+            imageSharingMode=vk.VK_SHARING_MODE_EXCLUSIVE,
+            preTransform=caps.currentTransform,
+            compositeAlpha=vk.VK_COMPOSITE_ALPHA_OPAQUE_BIT_KHR,
+            presentMode=self.present_mode,
+            clipped=vk.VK_TRUE,
+        )
+        
+        self.swap_chain = self._vkCreateSwapchainKHR(self.device, swap_chain_create_info, None)
+        self.swap_chain_images = tuple(self._vkGetSwapchainImagesKHR(self.device, self.swap_chain))
+        self.swap_chain_format = surface_format.format
+        self.swap_chain_extent = extent
+        
+        logger.info("Swapchain created: %d images, %s present mode", len(self.swap_chain_images),
+                    'mailbox' if self.present_mode == vk.VK_PRESENT_MODE_MAILBOX_KHR else 'fifo')
+    
+    def _recreate_swap_chain(self):
+        """Rebuild the swapchain after the surface changed (e.g. a resize)."""
+        with self._queue_lock:
+            vk.vkDeviceWaitIdle(self.device)
+        self._vkDestroySwapchainKHR(self.device, self.swap_chain, None)
+        self._create_swap_chain()
+    
+    def _create_frame_resources(self):
+        """Create the ring of resources used to build frames in flight."""
+        self._frames = [FrameResources(self.device, self.graphics_queue_family)
+                        for _ in range(FRAMES_IN_FLIGHT)]
+        self._frame_idx = FRAMES_IN_FLIGHT - 1
+        self._frame = self._frames[self._frame_idx]
+    
+    @property
+    def init_cb(self):
+        """Command buffer for this frame's uploads and other setup work."""
+        return self._frame.init_cb
+    
+    @property
+    def main_cb(self):
+        """Command buffer for this frame's scene rendering."""
+        return self._frame.main_cb
     
     def begin_frame(self):
-        # Begin rendering a new frame
-        # In a full implementation, this would:
-        # - Acquire the next swap chain image
-        # - Begin command buffer recording
-        pass
+        """Begin rendering a new frame.
+        
+        Advances to the next frame in the ring, waiting only if the GPU is
+        still working on the frame that last used it, then starts recording
+        the init and main command buffers. The swapchain image is not
+        acquired here; see end_frame.
+        """
+        self._frame_idx = (self._frame_idx + 1) % FRAMES_IN_FLIGHT
+        frame = self._frame = self._frames[self._frame_idx]
+        
+        vk.vkWaitForFences(self.device, 1, [frame.fence], vk.VK_TRUE, _UINT64_MAX)
+        vk.vkResetFences(self.device, 1, [frame.fence])
+        vk.vkResetCommandPool(self.device, frame.command_pool, 0)
+        
+        vk.vkBeginCommandBuffer(frame.init_cb, _ONE_TIME_BEGIN_INFO)
+        vk.vkBeginCommandBuffer(frame.main_cb, _ONE_TIME_BEGIN_INFO)
+        self._pending_cbs.extend((frame.init_cb, frame.main_cb))
+    
+    def queue_command_buffer(self, command_buffer):
+        """Queue a recorded command buffer for submission at end_frame.
+        
+        Never submit directly: every command buffer of a frame goes out in
+        one vkQueueSubmit, ahead of the present command buffer.
+        """
+        self._pending_cbs.append(command_buffer)
     
     def end_frame(self):
-        # End the current frame
-        # - End command buffer recording
-        # - Submit to queue
-        # - Present the swap chain image
-        pass
+        """Finish the frame: late-acquire the swapchain image, submit and present.
+        
+        Acquiring only now lets init/main be recorded while the presentation
+        engine is still deciding which image to hand back.
+        """
+        frame = self._frame
+        vk.vkEndCommandBuffer(frame.init_cb)
+        vk.vkEndCommandBuffer(frame.main_cb)
+        
+        # The binding raises for every result other than VK_SUCCESS
+        recreate = False
+        try:
+            self._vkAcquireNextImageKHR(
+                self.device, self.swap_chain, _ACQUIRE_TIMEOUT_NS, frame.image_available_sem,
+                vk.VK_NULL_HANDLE, self._image_index)
+        except vk.VkSuboptimalKhr:
+            # The image is acquired and the semaphore will signal, so present
+            # this frame and rebuild the swapchain afterwards
+            recreate = True
+        except (vk.VkErrorOutOfDateKhr, vk.VkTimeout, vk.VkNotReady) as e:
+            # Nothing was submitted, so drop the frame's command buffers and
+            # re-signal the fence for this frame slot
+            self._pending_cbs.clear()
+            with self._queue_lock:
+                vk.vkQueueSubmit(self.graphics_queue, 0, None, frame.fence)
+            if isinstance(e, vk.VkErrorOutOfDateKhr):
+                self._recreate_swap_chain()
+            return
+        image_index = self._image_index[0]
+        
+        self._record_present(frame.present_cb, self.swap_chain_images[image_index])
+        
+        # One submit for every command buffer of the frame
+        pending = self._pending_cbs
+        pending.append(frame.present_cb)
+        submit_info = vk.VkSubmitInfo(
+            waitSemaphoreCount=1,
+            pWaitSemaphores=[frame.image_available_sem],
+            pWaitDstStageMask=[vk.VK_PIPELINE_STAGE_TRANSFER_BIT],
+            commandBufferCount=len(pending),
+            pCommandBuffers=pending,
+            signalSemaphoreCount=1,
+            pSignalSemaphores=[frame.render_finished_sem],
+        )
+        with self._queue_lock:
+            vk.vkQueueSubmit(self.graphics_queue, 1, [submit_info], frame.fence)
+        pending.clear()
+        
+        present_info = vk.VkPresentInfoKHR(
+            waitSemaphoreCount=1,
+            pWaitSemaphores=[frame.render_finished_sem],
+            swapchainCount=1,
+            pSwapchains=[self.swap_chain],
+            pImageIndices=[image_index],
+        )
+        try:
+            with self._queue_lock:
+                self._vkQueuePresentKHR(self.graphics_queue, present_info)
+        except (vk.VkErrorOutOfDateKhr, vk.VkSuboptimalKhr):
+            recreate = True
+        if recreate:
+            self._recreate_swap_chain()
+    
+    def _record_present(self, command_buffer, image):
+        """Record the transition of the acquired image to presentable state."""
+        vk.vkBeginCommandBuffer(command_buffer, _ONE_TIME_BEGIN_INFO)
+        
+        to_transfer = vk.VkImageMemoryBarrier(
+            srcAccessMask=0,
+            dstAccessMask=vk.VK_ACCESS_TRANSFER_WRITE_BIT,
+            oldLayout=vk.VK_IMAGE_LAYOUT_UNDEFINED,
+            newLayout=vk.VK_IMAGE_LAYOUT_TRANSFER_DST_OPTIMAL,
+            srcQueueFamilyIndex=vk.VK_QUEUE_FAMILY_IGNORED,
+            dstQueueFamilyIndex=vk.VK_QUEUE_FAMILY_IGNORED,
+            image=image,
+            subresourceRange=_COLOR_SUBRESOURCE_RANGE,
+        )
+        barriers = self.barriers
+        barriers.add_image(to_transfer, vk.VK_PIPELINE_STAGE_TRANSFER_BIT, vk.VK_PIPELINE_STAGE_TRANSFER_BIT)
+        barriers.flush(command_buffer)
+        
+        vk.vkCmdClearColorImage(
+            command_buffer, image, vk.VK_IMAGE_LAYOUT_TRANSFER_DST_OPTIMAL,
+            vk.VkClearColorValue(float32=self.clear_color), 1, [_COLOR_SUBRESOURCE_RANGE])
+        
+        to_present = vk.VkImageMemoryBarrier(
+            srcAccessMask=vk.VK_ACCESS_TRANSFER_WRITE_BIT,
+            dstAccessMask=0,
+            oldLayout=vk.VK_IMAGE_LAYOUT_TRANSFER_DST_OPTIMAL,
+            newLayout=vk.VK_IMAGE_LAYOUT_PRESENT_SRC_KHR,
+            srcQueueFamilyIndex=vk.VK_QUEUE_FAMILY_IGNORED,
+            dstQueueFamilyIndex=vk.VK_QUEUE_FAMILY_IGNORED,
+            image=image,
+            subresourceRange=_COLOR_SUBRESOURCE_RANGE,
+        )
+        barriers.add_image(to_present, vk.VK_PIPELINE_STAGE_TRANSFER_BIT, vk.VK_PIPELINE_STAGE_BOTTOM_OF_PIPE_BIT)
+        barriers.flush(command_buffer)
+        
+        vk.vkEndCommandBuffer(command_buffer)
+    
+    def upload_texture(self, data, width, height):
+        """Upload RGBA8 pixels to a device-local image on the transfer queue.
+        
+        Recording and submission happen on a background thread; returns a
+        concurrent.futures.Future resolving to the uploaded Texture.
+        """
+        return self._uploader.upload(data, width, height)
     
     def cleanup(self):
         # Clean up Vulkan resources
+        if self.device:
+            if self._uploader:
+                self._uploader.destroy()
+                self._uploader = None
+            vk.vkDeviceWaitIdle(self.device)
+            for frame in self._frames:
+                frame.destroy(self.device)
+            self._frames = []
+            self._frame = None
+            
+            if self.swap_chain:
+                self._vkDestroySwapchainKHR(self.device, self.swap_chain, None)
+                self.swap_chain = None
+                self.swap_chain_images = ()
+            
+            vk.vkDestroyDevice(self.device, None)
+            self.device = None
+        
         if self.instance:
             if self.surface:
-                vk.vkDestroySurfaceKHR(self.instance, self.surface, None)
+                self._vkDestroySurfaceKHR(self.instance, self.surface, None)
                 self.surface = None
                 
             vk.vkDestroyInstance(self.instance, None)
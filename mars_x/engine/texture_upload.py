@@ -0,0 +1,200 @@
+"""
+Background texture uploads over a dedicated Vulkan transfer queue.
+"""
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+import vulkan as vk
+from mars_x.engine.barrier_batch import BarrierBatch
+
+_UINT64_MAX = 0xFFFFFFFFFFFFFFFF
+
+_COLOR_SUBRESOURCE_RANGE = vk.VkImageSubresourceRange(
+    aspectMask=vk.VK_IMAGE_ASPECT_COLOR_BIT,
+    baseMipLevel=0,
+    levelCount=1,
+    baseArrayLayer=0,
+    layerCount=1,
+)
+
+_COLOR_SUBRESOURCE_LAYERS = vk.VkImageSubresourceLayers(
+    aspectMask=vk.VK_IMAGE_ASPECT_COLOR_BIT,
+    mipLevel=0,
+    baseArrayLayer=0,
+    layerCount=1,
+)
+
+_ONE_TIME_BEGIN_INFO = vk.VkCommandBufferBeginInfo(
+    flags=vk.VK_COMMAND_BUFFER_USAGE_ONE_TIME_SUBMIT_BIT,
+)
+
+class Texture:
+    """A device-local RGBA8 image and the memory backing it."""
+    
+    def __init__(self, image, memory, width, height):
+        self.image = image
+        self.memory = memory
+        self.width = width
+        self.height = height
+    
+    def destroy(self, device):
+        vk.vkDestroyImage(device, self.image, None)
+        vk.vkFreeMemory(device, self.memory, None)
+
+class TextureUploader:
+    """
+    Records and submits texture uploads on a single worker thread.
+    
+    The worker owns its command pool and fence, so recording never contends
+    with the render thread; the GIL is released while Vulkan calls run.
+    Images are shared concurrently with the graphics queue family when the
+    transfer family differs, so no queue ownership transfer is needed.
+    Pass `queue_lock` when `queue` is also the render thread's queue.
+    """
+    
+    def __init__(self, device, physical_device, queue, queue_family, graphics_queue_family,
+                 queue_lock=None):
+        self.device = device
+        self.queue = queue
+        self._queue_lock = queue_lock or contextlib.nullcontext()
+        self.textures = []
+        
+        self._memory_properties = vk.vkGetPhysicalDeviceMemoryProperties(physical_device)
+        if queue_family == graphics_queue_family:
+            self._sharing = (vk.VK_SHARING_MODE_EXCLUSIVE, ())
+        else:
+            self._sharing = (vk.VK_SHARING_MODE_CONCURRENT, (queue_family, graphics_queue_family))
+        
+        pool_create_info = vk.VkCommandPoolCreateInfo(
+            flags=vk.VK_COMMAND_POOL_CREATE_TRANSIENT_BIT | vk.VK_COMMAND_POOL_CREATE_RESET_COMMAND_BUFFER_BIT,
+            queueFamilyIndex=queue_family,
+        )
+        self._command_pool = vk.vkCreateCommandPool(device, pool_create_info, None)
+        alloc_info = vk.VkCommandBufferAllocateInfo(
+            commandPool=self._command_pool,
+            level=vk.VK_COMMAND_BUFFER_LEVEL_PRIMARY,
+            commandBufferCount=1,
+        )
+        self._command_buffer = vk.vkAllocateCommandBuffers(device, alloc_info)[0]
+        self._fence = vk.vkCreateFence(device, vk.VkFenceCreateInfo(), None)
+        self._barriers = BarrierBatch()
+        
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mars-x-upload')
+    
+    def upload(self, data, width, height):
+        """Queue an RGBA8 upload; returns a Future resolving to the Texture."""
+        return self._executor.submit(self._upload, bytes(data), width, height)
+    
+    def _find_memory_type(self, type_bits, flags):
+        props = self._memory_properties
+        for i in range(props.memoryTypeCount):
+            if type_bits & (1 << i) and props.memoryTypes[i].propertyFlags & flags == flags:
+                return i
+        raise RuntimeError("No suitable Vulkan memory type for texture upload")
+    
+    def _allocate(self, requirements, flags):
+        alloc_info = vk.VkMemoryAllocateInfo(
+            allocationSize=requirements.size,
+            memoryTypeIndex=self._find_memory_type(requirements.memoryTypeBits, flags),
+        )
+        return vk.vkAllocateMemory(self.device, alloc_info, None)
+    
+    def _upload(self, data, width, height):
+        device = self.device
+        
+        # Staging buffer holding the pixels in host-visible memory
+        staging = vk.vkCreateBuffer(device, vk.VkBufferCreateInfo(
+            size=len(data),
+            usage=vk.VK_BUFFER_USAGE_TRANSFER_SRC_BIT,
+            sharingMode=vk.VK_SHARING_MODE_EXCLUSIVE,
+        ), None)
+        staging_memory = self._allocate(
+            vk.vkGetBufferMemoryRequirements(device, staging),
+            vk.VK_MEMORY_PROPERTY_HOST_VISIBLE_BIT | vk.VK_MEMORY_PROPERTY_HOST_COHERENT_BIT)
+        vk.vkBindBufferMemory(device, staging, staging_memory, 0)
+        
+        mapped = vk.vkMapMemory(device, staging_memory, 0, len(data), 0)
+        mapped[:len(data)] = data
+        vk.vkUnmapMemory(device, staging_memory)
+        
+        # Device-local image the pixels end up in
+        sharing_mode, families = self._sharing
+        image = vk.vkCreateImage(device, vk.VkImageCreateInfo(
+            imageType=vk.VK_IMAGE_TYPE_2D,
+            format=vk.VK_FORMAT_R8G8B8A8_UNORM,
+            extent=vk.VkExtent3D(width=width, height=height, depth=1),
+            mipLevels=1,
+            arrayLayers=1,
+            samples=vk.VK_SAMPLE_COUNT_1_BIT,
+            tiling=vk.VK_IMAGE_TILING_OPTIMAL,
+            usage=vk.VK_IMAGE_USAGE_TRANSFER_DST_BIT | vk.VK_IMAGE_USAGE_SAMPLED_BIT,
+            sharingMode=sharing_mode,
+            queueFamilyIndexCount=len(families),
+            pQueueFamilyIndices=families or None,
+            initialLayout=vk.VK_IMAGE_LAYOUT_UNDEFINED,
+        ), None)
+        image_memory = self._allocate(
+            vk.vkGetImageMemoryRequirements(device, image), vk.VK_MEMORY_PROPERTY_DEVICE_LOCAL_BIT)
+        vk.vkBindImageMemory(device, image, image_memory, 0)
+        
+        # Record: UNDEFINED -> TRANSFER_DST, copy, TRANSFER_DST -> SHADER_READ_ONLY
+        cmd = self._command_buffer
+        barriers = self._barriers
+        vk.vkBeginCommandBuffer(cmd, _ONE_TIME_BEGIN_INFO)
+        
+        barriers.add_image(vk.VkImageMemoryBarrier(
+            srcAccessMask=0,
+            dstAccessMask=vk.VK_ACCESS_TRANSFER_WRITE_BIT,
+            oldLayout=vk.VK_IMAGE_LAYOUT_UNDEFINED,
+            newLayout=vk.VK_IMAGE_LAYOUT_TRANSFER_DST_OPTIMAL,
+            srcQueueFamilyIndex=vk.VK_QUEUE_FAMILY_IGNORED,
+            dstQueueFamilyIndex=vk.VK_QUEUE_FAMILY_IGNORED,
+            image=image,
+            subresourceRange=_COLOR_SUBRESOURCE_RANGE,
+        ), vk.VK_PIPELINE_STAGE_TOP_OF_PIPE_BIT, vk.VK_PIPELINE_STAGE_TRANSFER_BIT)
+        barriers.flush(cmd)
+        
+        region = vk.VkBufferImageCopy(
+            bufferOffset=0,
+            bufferRowLength=0,
+            bufferImageHeight=0,
+            imageSubresource=_COLOR_SUBRESOURCE_LAYERS,
+            imageOffset=vk.VkOffset3D(x=0, y=0, z=0),
+            imageExtent=vk.VkExtent3D(width=width, height=height, depth=1),
+        )
+        vk.vkCmdCopyBufferToImage(cmd, staging, image, vk.VK_IMAGE_LAYOUT_TRANSFER_DST_OPTIMAL, 1, [region])
+        
+        barriers.add_image(vk.VkImageMemoryBarrier(
+            srcAccessMask=vk.VK_ACCESS_TRANSFER_WRITE_BIT,
+            dstAccessMask=0,
+            oldLayout=vk.VK_IMAGE_LAYOUT_TRANSFER_DST_OPTIMAL,
+            newLayout=vk.VK_IMAGE_LAYOUT_SHADER_READ_ONLY_OPTIMAL,
+            srcQueueFamilyIndex=vk.VK_QUEUE_FAMILY_IGNORED,
+            dstQueueFamilyIndex=vk.VK_QUEUE_FAMILY_IGNORED,
+            image=image,
+            subresourceRange=_COLOR_SUBRESOURCE_RANGE,
+        ), vk.VK_PIPELINE_STAGE_TRANSFER_BIT, vk.VK_PIPELINE_STAGE_BOTTOM_OF_PIPE_BIT)
+        barriers.flush(cmd)
+        
+        vk.vkEndCommandBuffer(cmd)
+        
+        submit_info = vk.VkSubmitInfo(commandBufferCount=1, pCommandBuffers=[cmd])
+        with self._queue_lock:
+            vk.vkQueueSubmit(self.queue, 1, [submit_info], self._fence)
+        vk.vkWaitForFences(device, 1, [self._fence], vk.VK_TRUE, _UINT64_MAX)
+        vk.vkResetFences(device, 1, [self._fence])
+        
+        vk.vkDestroyBuffer(device, staging, None)
+        vk.vkFreeMemory(device, staging_memory, None)
+        
+        texture = Texture(image, image_memory, width, height)
+        self.textures.append(texture)
+        return texture
+    
+    def destroy(self):
+        """Finish pending uploads and release every uploaded texture."""
+        self._executor.shutdown(wait=True)
+        for texture in self.textures:
+            texture.destroy(self.device)
+        self.textures = []
+        vk.vkDestroyFence(self.device, self._fence, None)
+        vk.vkDestroyCommandPool(self.device, self._command_pool, None)
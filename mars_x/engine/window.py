@@ -3,20 +3,33 @@ import sdl2.ext
 import logging
 
 class Window:
-    def __init__(self, title, width, height):
+    def __init__(self, title, width, height, prefer_low_latency=True, vulkan=True):
         self.width = width
         self.height = height
         self.title = title.encode('utf-8')  # SDL2 expects bytes for strings
         self.is_fullscreen = False  # Track fullscreen state
+        # Present with mailbox/triple buffering when available; set False to
+        # force classic double-buffered FIFO vsync
+        self.prefer_low_latency = prefer_low_latency
+        self._vulkan_extensions = None  # Filled on first query; fixed per window
         
-        # Create SDL window with Vulkan flag
+        # Out-parameters reused by every SDL size query
+        self._w_scratch = sdl2.c_int()
+        self._h_scratch = sdl2.c_int()
+        
+        # Create SDL window, with the Vulkan flag only when a VulkanRenderer
+        # will draw to it; an SDL_Renderer on a Vulkan window makes SDL
+        # destroy and recreate the window for its own backend
+        flags = sdl2.SDL_WINDOW_RESIZABLE
+        if vulkan:
+            flags |= sdl2.SDL_WINDOW_VULKAN
         self.window = sdl2.SDL_CreateWindow(
             self.title,
             sdl2.SDL_WINDOWPOS_CENTERED, 
             sdl2.SDL_WINDOWPOS_CENTERED,
             self.width, 
             self.height,
-            sdl2.SDL_WINDOW_VULKAN | sdl2.SDL_WINDOW_RESIZABLE
+            flags
         )
         
         if not self.window:
@@ -29,7 +42,10 @@ class Window:
         return self.window
     
     def get_vulkan_instance_extensions(self):
-        """Get required Vulkan instance extensions for this window."""
+        """Get required Vulkan instance extensions for this window as a tuple."""
+        if self._vulkan_extensions is not None:
+            return self._vulkan_extensions
+        
         # Get the required Vulkan instance extensions from SDL
         extension_count = sdl2.c_uint32(0)
         sdl2.SDL_Vulkan_GetInstanceExtensions(self.window, extension_count, None)
@@ -38,8 +54,9 @@ class Window:
         extensions = (sdl2.c_char_p * extension_count.value)()
         sdl2.SDL_Vulkan_GetInstanceExtensions(self.window, extension_count, extensions)
         
-        # Convert to a Python list
-        return [extensions[i].decode() for i in range(extension_count.value)]
+        # Decode once and keep the result
+        self._vulkan_extensions = tuple(name.decode() for name in extensions)
+        return self._vulkan_extensions
     
     def create_vulkan_surface(self, instance):
         """Create a Vulkan surface for this window."""
@@ -56,19 +73,15 @@ class Window:
         sdl2.SDL_SetWindowFullscreen(self.window, flags)
         
         # Get updated window size after toggle
-        w = sdl2.c_int()
-        h = sdl2.c_int()
-        sdl2.SDL_GetWindowSize(self.window, w, h)
-        self.width = w.value
-        self.height = h.value
+        self.width, self.height = self.get_size()
         
         logging.info(f"Window {'fullscreen' if self.is_fullscreen else 'windowed'} mode: {self.width}x{self.height}")
         return self.is_fullscreen
     
     def get_size(self):
         """Get the current window size."""
-        w = sdl2.c_int()
-        h = sdl2.c_int()
+        w = self._w_scratch
+        h = self._h_scratch
         sdl2.SDL_GetWindowSize(self.window, w, h)
         return (w.value, h.value)
     
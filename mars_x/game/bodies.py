@@ -0,0 +1,68 @@
+"""
+Structure-of-arrays storage for entity physics state in Mars-X.
+"""
+
+def _zeroed(fmt, itemsize, shape):
+    """Allocate a zero-filled, C-contiguous memoryview with the given format and shape."""
+    count = 1
+    for dim in shape:
+        count *= dim
+    return memoryview(bytearray(itemsize * count)).cast(fmt, shape)
+
+class BodyBuffers:
+    """
+    Contiguous float32 position/velocity/mass/input-speed arrays plus an
+    active flag per slot. The buffers are plain memoryviews, so they can be passed
+    straight to Cython functions taking typed memoryviews.
+    """
+    
+    def __init__(self, capacity=16):
+        self.capacity = 0
+        self.count = 0  # Slots [0, count) have been handed out at least once
+        self._free_slots = []
+        
+        self.pos = None     # float32 [x, y] rows
+        self.vel = None     # float32 [vx, vy] rows
+        self.mass = None    # float32
+        self.input_speed = None  # float32 WASD speed, 0 for slots not driven by input
+        self.active = None  # uint8 flags
+        self._grow(max(1, capacity))
+    
+    def _grow(self, capacity):
+        """Reallocate every buffer with a larger capacity, keeping existing rows."""
+        old_capacity = self.capacity
+        
+        for name, fmt, itemsize, cols in (('pos', 'f', 4, 2), ('vel', 'f', 4, 2),
+                                          ('mass', 'f', 4, 0), ('input_speed', 'f', 4, 0),
+                                          ('active', 'B', 1, 0)):
+            shape = (capacity, cols) if cols else (capacity,)
+            grown = _zeroed(fmt, itemsize, shape)
+            if old_capacity:
+                grown.cast('B')[:old_capacity * itemsize * (cols or 1)] = getattr(self, name).cast('B')
+            setattr(self, name, grown)
+        
+        self.capacity = capacity
+    
+    def alloc(self, x=0.0, y=0.0, vx=0.0, vy=0.0, mass=1.0, active=True, input_speed=0.0):
+        """Reserve a slot, initialize it and return its index."""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self.count == self.capacity:
+                self._grow(max(1, self.capacity * 2))
+            slot = self.count
+            self.count += 1
+        
+        self.pos[slot, 0] = x
+        self.pos[slot, 1] = y
+        self.vel[slot, 0] = vx
+        self.vel[slot, 1] = vy
+        self.mass[slot] = mass
+        self.input_speed[slot] = input_speed
+        self.active[slot] = active
+        return slot
+    
+    def release(self, slot):
+        """Return a slot to the pool; it is skipped by physics until reused."""
+        self.active[slot] = False
+        self._free_slots.append(slot)
@@ -1,51 +1,131 @@
 """
 Base entity class for game objects in Mars-X.
 """
+import itertools
 import logging
-from mars_x.cython_modules.rigidbody import Entity as CythonEntity  # type: ignore
+from mars_x.game.bodies import BodyBuffers
+
+logger = logging.getLogger(__name__)
+
+# Source of unique integer entity IDs
+_next_id = itertools.count()
 
 class Entity:
-    """Base class for all game entities."""
+    """
+    Base class for all game entities.
+    Position, velocity, mass, input speed and the active flag live in a
+    BodyBuffers slot:
+    a private one-slot buffer until the entity is started in a world, then
+    the world's shared buffers.
+    """
     
     def __init__(self, x=0.0, y=0.0):
-        self.x = x
-        self.y = y
-        self.active = True
-        self.physics_entity = None  # Reference to the Cython physics entity
+        self.id = next(_next_id)
+        self.world = None  # Set while the entity is part of a GameWorld
+        self._index = -1   # Position in world.entities, maintained by the world
+        self._bodies = BodyBuffers(capacity=1)
+        self.slot = self._bodies.alloc(x, y)
+        self.rotation = 0.0
         self.width = 10.0  # Default width for collision detection
         self.height = 10.0  # Default height for collision detection
     
+    @property
+    def x(self):
+        return self._bodies.pos[self.slot, 0]
+    
+    @x.setter
+    def x(self, value):
+        self._bodies.pos[self.slot, 0] = value
+    
+    @property
+    def y(self):
+        return self._bodies.pos[self.slot, 1]
+    
+    @y.setter
+    def y(self, value):
+        self._bodies.pos[self.slot, 1] = value
+    
+    @property
+    def vx(self):
+        return self._bodies.vel[self.slot, 0]
+    
+    @vx.setter
+    def vx(self, value):
+        self._bodies.vel[self.slot, 0] = value
+    
+    @property
+    def vy(self):
+        return self._bodies.vel[self.slot, 1]
+    
+    @vy.setter
+    def vy(self, value):
+        self._bodies.vel[self.slot, 1] = value
+    
+    @property
+    def mass(self):
+        return self._bodies.mass[self.slot]
+    
+    @mass.setter
+    def mass(self, value):
+        self._bodies.mass[self.slot] = value
+    
+    @property
+    def input_speed(self):
+        """Speed of WASD-driven movement applied by the physics step (0 = none)."""
+        return self._bodies.input_speed[self.slot]
+    
+    @input_speed.setter
+    def input_speed(self, value):
+        self._bodies.input_speed[self.slot] = value
+    
+    @property
+    def active(self):
+        return bool(self._bodies.active[self.slot])
+    
+    @active.setter
+    def active(self, value):
+        value = bool(value)
+        if value != self.active:
+            self._bodies.active[self.slot] = value
+            # Keep the world's active partition in sync
+            if self.world is not None:
+                self.world._set_entity_active(self, value)
+    
+    @property
+    def radius(self):
+        """Collision radius derived from width/height."""
+        return max(self.width, self.height) / 2
+    
+    def _move_to(self, bodies):
+        """Copy this entity's physics state into a new slot of `bodies`."""
+        old_bodies, old_slot = self._bodies, self.slot
+        self.slot = bodies.alloc(self.x, self.y, self.vx, self.vy, self.mass, self.active, self.input_speed)
+        self._bodies = bodies
+        old_bodies.release(old_slot)
+    
     def start(self, world=None):
         """
         Initialize the entity after it's added to the world.
+        Moves the physics state into the world's shared buffers.
         Override in subclasses for custom initialization.
         """
-        # Always create a Cython physics entity
-        physics_entity = CythonEntity()
+        if world is not None:
+            self._move_to(world.bodies)
+        self.world = world
         
-        # Copy properties from game entity to physics entity
-        physics_entity.x = self.x
-        physics_entity.y = self.y
-        physics_entity.vx = getattr(self, 'vx', 0.0)
-        physics_entity.vy = getattr(self, 'vy', 0.0)
-        physics_entity.mass = getattr(self, 'mass', 1.0)
-        physics_entity.rotation = getattr(self, 'rotation', 0.0)
-        physics_entity.active = self.active
-        
-        # Calculate radius from width/height if available
-        physics_entity.radius = max(self.width, self.height) / 2
-        
-        # Store the physics entity
-        self.physics_entity = physics_entity
-        
-        logging.debug(f"Physics entity created for {self.__class__.__name__} with radius {physics_entity.radius}")
-        
-        return physics_entity
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Physics slot %d assigned to %s #%d with radius %s",
+                         self.slot, self.__class__.__name__, self.id, self.radius)
+    
+    def stop(self):
+        """Detach the entity from the world's buffers when it is removed."""
+        self.world = None
+        self._move_to(BodyBuffers(capacity=1))
     
     def update(self, input_manager, delta_time):
         """Update entity state. Override in subclasses."""
         pass
     
-    def render(self, renderer):
-        """Render the entity. Override in subclasses."""
+    def render(self, batch):
+        """Queue the entity's draw calls on a RectBatch. Override in subclasses."""
         pass
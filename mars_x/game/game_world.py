@@ -1,22 +1,32 @@
 import logging
 import sdl2
+from mars_x.game.entity import Entity
 from mars_x.game.player import Player
+from mars_x.game.bodies import BodyBuffers
+from mars_x.engine.rect_batch import RectBatch
 
 # Import the Cython physics module - no fallbacks
-from mars_x.cython_modules.rigidbody import update_positions, apply_force, Entity as CythonEntity  # type: ignore
+from mars_x.cython_modules.rigidbody import update_world  # type: ignore
+
+logger = logging.getLogger(__name__)
 
 class GameWorld:
     def __init__(self, renderer):
         self.renderer = renderer
-        self.entities = []
-        self.rigidbody = []  # Entities that will be processed by Cython physics
+        self.batch = RectBatch(renderer)  # Entities queue their draws here
+        self.entities = []       # Partitioned: entities[:_active_count] are active
+        self._active_count = 0
+        # Insertion-ordered sets (dicts with None values) for O(1) removal
+        self._updatables = {}   # Active entities that override Entity.update
+        self._renderables = {}  # Active entities that override Entity.render
+        self.bodies = BodyBuffers()  # SoA physics state processed by Cython physics
         self.player = None
         self.init_world()
-        logging.info("Game world initialized")
+        logger.info("Game world initialized")
     
     def init_world(self):
         """Initialize the game world with entities including the player."""
-        logging.info("Initializing game world...")
+        logger.info("Initializing game world...")
         
         # Create player entity
         self.player = Player()
@@ -27,60 +37,100 @@ class GameWorld:
     def add_entity(self, entity):
         """
         Add an entity to the game world.
-        If the entity has physics properties, it will also be added to the physics system.
+        Starting the entity moves its physics state into the world's buffers.
         """
-        if entity not in self.entities:
+        if entity.world is not self:
+            entity._index = len(self.entities)
             self.entities.append(entity)
             
-            # Initialize the entity and add to physics system if needed
-            rigidbody = entity.start(self)
-            if rigidbody:
-                self.rigidbody.append(rigidbody)
-                logging.debug(f"Added entity to physics system: {entity}")
+            # Initialize the entity, which claims a physics slot
+            entity.start(self)
+            if entity.active:
+                self._set_entity_active(entity, True)
             
-            logging.debug(f"Added entity to game world: {entity}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Added entity to game world: %s", entity)
             return True
         return False
     
     def remove_entity(self, entity):
         """Remove an entity from the game world and physics system if present."""
-        if entity in self.entities:
-            self.entities.remove(entity)
+        if entity.world is self:
+            if entity.active:
+                self._set_entity_active(entity, False)
+            
+            # Swap-pop; the entity is in the inactive range now, and so is
+            # the last entity, so the partition is preserved
+            entities = self.entities
+            last = entities.pop()
+            if last is not entity:
+                entities[entity._index] = last
+                last._index = entity._index
+            entity._index = -1
             
-            # Also remove from physics if it has a physics entity
-            if hasattr(entity, 'rigidbody') and entity.rigidbody in self.rigidbody:
-                self.rigidbody.remove(entity.rigidbody)
-                logging.debug(f"Removed entity from physics system: {entity}")
+            # Release the entity's physics slot
+            entity.stop()
             
-            logging.debug(f"Removed entity from game world: {entity}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Removed entity from game world: %s", entity)
             return True
         return False
     
+    def _set_entity_active(self, entity, active):
+        """
+        Move an entity across the active/inactive partition of `entities`
+        (swapping with the entity at the boundary) and add it to or drop it
+        from the per-frame update/render passes. Called by Entity.active.
+        Does nothing if the entity is already on that side, e.g. when its
+        start() toggles `active` before add_entity has counted it.
+        """
+        if (entity._index < self._active_count) == active:
+            return
+        
+        entities = self.entities
+        if active:
+            boundary = self._active_count
+            self._active_count += 1
+        else:
+            self._active_count -= 1
+            boundary = self._active_count
+        
+        other = entities[boundary]
+        entities[entity._index], entities[boundary] = other, entity
+        other._index, entity._index = entity._index, boundary
+        
+        # Only take part in the passes the entity's class actually overrides
+        entity_type = type(entity)
+        for method, passes in (('update', self._updatables), ('render', self._renderables)):
+            if getattr(entity_type, method) is not getattr(Entity, method):
+                if active:
+                    passes[entity] = None
+                else:
+                    del passes[entity]
+    
     def update(self, input_manager, delta_time=1/60):
         """Update game state based on input and game logic."""
-        # Update all entities with the current input state
-        for entity in self.entities:
-            if hasattr(entity, 'update'):
+        # Update all entities with the current input state. Iterate a
+        # snapshot, since an update may add, remove or deactivate entities;
+        # skip any that dropped out of the pass earlier in this loop
+        updatables = self._updatables
+        for entity in tuple(updatables):
+            if entity in updatables:
                 entity.update(input_manager, delta_time)
-                
-                # Sync positions from game entity to physics entity if needed
-                if hasattr(entity, 'rigidbody') and entity.rigidbody in self.rigidbody:
-                    entity.rigidbody.x = entity.x
-                    entity.rigidbody.y = entity.y
         
-        # Update physics using Cython
-        if self.rigidbody:
-            update_positions(self.rigidbody, delta_time)
-            
-            # Sync positions from physics entities back to game entities
-            for entity in self.entities:
-                if hasattr(entity, 'rigidbody') and entity.rigidbody in self.rigidbody:
-                    entity.x = entity.rigidbody.x
-                    entity.y = entity.rigidbody.y
+        # Apply WASD movement and physics in one Cython pass; entities read
+        # and write the same buffers, so no syncing is needed in either direction
+        bodies = self.bodies
+        if bodies.count:
+            update_world(bodies.pos, bodies.vel, bodies.input_speed, bodies.active,
+                         bodies.count, input_manager.snapshot(), delta_time)
     
     def render(self):
         """Render the game world using the active renderer."""
-        # Let each entity render itself
-        for entity in self.entities:
-            if hasattr(entity, 'render'):
-                entity.render(self.renderer)
+        # Let each entity queue its draws, then submit them in per-color batches
+        renderables = self._renderables
+        for entity in tuple(renderables):
+            if entity in renderables:
+                entity.render(self.batch)
+        
+        self.batch.flush()
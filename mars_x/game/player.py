@@ -2,10 +2,10 @@
 Player entity implementation for Mars-X.
 """
 import logging
-import ctypes
-import sdl2
 from mars_x.game.entity import Entity
 
+logger = logging.getLogger(__name__)
+
 class Player(Entity):
     """Represents the player entity in the game world."""
     
@@ -16,77 +16,43 @@ class Player(Entity):
         # Player-specific properties
         self.width = 50
         self.height = 50
+        self._half_w = self.width >> 1  # Integer center-to-corner offsets
+        self._half_h = self.height >> 1
         self.speed = 300.0  # Speed in pixels per second (increased from 5.0)
         self.color = (255, 0, 0, 255)  # Red
         self.mass = 1.0
         
-        logging.info(f"Player initialized at position ({self.x}, {self.y})")
+        logger.info("Player initialized at position (%.1f, %.1f)", self.x, self.y)
     
     def start(self, world=None):
         """Initialize player in the game world."""
         # Call the parent start method to set up physics
-        physics_entity = super().start(world)
-        
-        if physics_entity:
-            # Additional player-specific physics setup
-            physics_entity.mass = self.mass
-            physics_entity.radius = max(self.width, self.height) / 2
-            
-            logging.info(f"Added player to physics system with radius {physics_entity.radius}")
+        super().start(world)
         
-        return physics_entity
+        logger.info("Added player to physics system with radius %s", self.radius)
     
-    def update(self, input_manager, delta_time=1/60):
-        """Update player position based on input."""
-        # Handle movement based on input manager and delta time
-        self.handle_input(input_manager, delta_time)
+    @property
+    def speed(self):
+        """Movement speed in pixels per second; WASD movement is applied by
+        the world's physics step (rigidbody.update_world)."""
+        return self.input_speed
     
-    def handle_input(self, input_manager, delta_time):
-        """Handle player input and update position accordingly using delta time."""
-        moved = False
-        
-        # Calculate frame-adjusted movement distance
-        movement = self.speed * delta_time
-        
-        # Check for WASD movement
-        if input_manager.is_action_active('move_forward'):
-            self.y -= movement
-            moved = True
-            
-        if input_manager.is_action_active('move_backward'):
-            self.y += movement
-            moved = True
-            
-        if input_manager.is_action_active('move_left'):
-            self.x -= movement
-            moved = True
-            
-        if input_manager.is_action_active('move_right'):
-            self.x += movement
-            moved = True
-            
-        # Log movement if any occurred (but not on every frame to avoid log spam)
-        if moved and delta_time > 0.01:  # Only log occasionally
-            logging.debug(f"Player moved to ({self.x:.1f}, {self.y:.1f}), delta: {delta_time:.4f}")
+    @speed.setter
+    def speed(self, value):
+        self.input_speed = value
     
     def get_rect(self):
-        """Get rectangle (x, y, width, height) for rendering."""
-        # Convert center position to top-left corner for rendering
-        left = self.x - (self.width / 2)
-        top = self.y - (self.height / 2)
+        """Get integer pixel rectangle (x, y, width, height) for rendering."""
+        # Convert center position to top-left corner: one float->int
+        # conversion per axis, then integer math
+        left = int(self.x) - self._half_w
+        top = int(self.y) - self._half_h
         return (left, top, self.width, self.height)
     
-    def render(self, renderer):
-        """Render the player using the provided renderer."""
-        if not self.active:
-            return
-            
-        # Set red color for player rectangle
-        sdl2.SDL_SetRenderDrawColor(renderer, 255, 0, 0, 255)  # Red
-        
+    def render(self, batch):
+        """Queue the player rectangle on the provided RectBatch."""
         # Get player rectangle coordinates (convert from center position to top-left)
-        rect = self.get_rect()
-        sdl_rect = sdl2.SDL_Rect(int(rect[0]), int(rect[1]), int(rect[2]), int(rect[3]))
+        left, top, width, height = self.get_rect()
         
-        # Draw filled rectangle
-        sdl2.SDL_RenderFillRect(renderer, ctypes.byref(sdl_rect))
+        # Draw filled rectangle in the player color
+        batch.draw_rect(left, top, width, height, self.color)
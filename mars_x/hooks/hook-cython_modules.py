@@ -1,37 +1,29 @@
 # Cython modules runtime hook for PyInstaller
 import os
 import sys
-import importlib.util
+import importlib.abc
 import importlib.machinery
 import types
 
-def ensure_directory_exists(path):
-    """Create directory if it doesn't exist."""
-    if not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
-
-def create_init_file(directory):
-    """Create an empty __init__.py file in the directory if it doesn't exist."""
-    init_file = os.path.join(directory, '__init__.py')
-    if not os.path.exists(init_file):
-        with open(init_file, 'w') as f:
-            f.write('# Auto-generated __init__.py file for PyInstaller\n')
-    return init_file
-
-def load_binary_module(name, path):
-    """Load a binary module (.pyd/.so) directly."""
-    try:
-        loader = importlib.machinery.ExtensionFileLoader(name, path)
-        spec = importlib.util.spec_from_file_location(name, path, loader=loader)
-        if spec:
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[name] = module
-            spec.loader.exec_module(module)
-            print(f"Successfully loaded {name} from {path}")
-            return module
-    except Exception as e:
-        print(f"Error loading {name} from {path}: {e}")
-    return None
+class _CythonBundleFinder(importlib.abc.MetaPathFinder):
+    """
+    Resolves the bundled Cython extensions from a fixed {name: path} table,
+    so an extension is only loaded when it is first imported.
+    """
+    
+    def __init__(self, table):
+        self._table = table
+    
+    def find_spec(self, fullname, path, target=None):
+        module_path = self._table.get(fullname)
+        if module_path is None:
+            return None
+        # Build the spec directly; spec_from_file_location would only
+        # re-derive what the table already knows
+        loader = importlib.machinery.ExtensionFileLoader(fullname, module_path)
+        spec = importlib.machinery.ModuleSpec(fullname, loader, origin=module_path)
+        spec.has_location = True  # Sets __file__ on the module
+        return spec
 
 # This runs when the frozen application starts
 if getattr(sys, 'frozen', False):
@@ -43,47 +35,46 @@ if getattr(sys, 'frozen', False):
     if os.path.exists(cython_modules_path):
         print(f"Found Cython modules directory: {cython_modules_path}")
         
-        # Make sure mars_x package exists
-        if 'mars_x' not in sys.modules:
+        # Make sure the mars_x and mars_x.cython_modules packages exist. The
+        # bundle already contains both directories, so only the module
+        # objects are synthesized; nothing is written to disk. Runtime hooks
+        # run before the entry script on a single thread, so nothing else
+        # can be importing mars_x yet
+        mars_x_module = sys.modules.get('mars_x')
+        if mars_x_module is None:
             mars_x_module = types.ModuleType('mars_x')
-            sys.modules['mars_x'] = mars_x_module
             mars_x_module.__path__ = [os.path.join(root_path, 'mars_x')]
-            # Create package directory
-            ensure_directory_exists(os.path.join(root_path, 'mars_x'))
-            # Create __init__.py
-            create_init_file(os.path.join(root_path, 'mars_x'))
+            mars_x_module.__spec__ = importlib.machinery.ModuleSpec('mars_x', None, is_package=True)
+            sys.modules['mars_x'] = mars_x_module
         
-        # Make sure mars_x.cython_modules package exists
-        if 'mars_x.cython_modules' not in sys.modules:
+        cython_module = sys.modules.get('mars_x.cython_modules')
+        if cython_module is None:
             cython_module = types.ModuleType('mars_x.cython_modules')
-            sys.modules['mars_x.cython_modules'] = cython_module
             cython_module.__path__ = [cython_modules_path]
-            # Create __init__.py
-            init_file = create_init_file(cython_modules_path)
+            cython_module.__spec__ = importlib.machinery.ModuleSpec('mars_x.cython_modules', None, is_package=True)
+            sys.modules['mars_x.cython_modules'] = cython_module
+        
+        # Bind the submodule on its parent as a normal import would
+        mars_x_module.cython_modules = cython_module
+        
+        # List the directory once instead of probing each candidate file
+        entries = {entry.name: entry.path for entry in os.scandir(cython_modules_path) if entry.is_file()}
         
-        # Load all the compiled modules
-        module_files = [
-            ('vector', os.path.join(cython_modules_path, 'vector.cp312-win_amd64.pyd')),
-            ('rigidbody', os.path.join(cython_modules_path, 'rigidbody.cp312-win_amd64.pyd')),
-            ('collision', os.path.join(cython_modules_path, 'collision.cp312-win_amd64.pyd')),
-            ('matrix', os.path.join(cython_modules_path, 'matrix.cp312-win_amd64.pyd')),
-            ('quaternion', os.path.join(cython_modules_path, 'quaternion.cp312-win_amd64.pyd'))
-        ]
+        # Extension suffixes this interpreter can load, most specific first
+        # (e.g. .cp312-win_amd64.pyd then .pyd); the other platform's are
+        # never candidates
+        suffixes = importlib.machinery.EXTENSION_SUFFIXES
         
-        # Ensure all extensions are considered (.pyd for Windows, .so for Unix)
-        extensions = ['.pyd', '.so']
+        # Map each available module to its file; nothing is loaded yet
+        module_names = ['vector', 'rigidbody', 'collision', 'matrix', 'quaternion', 'input_core', 'frame']
+        table = {}
+        for module_name in module_names:
+            for suffix in suffixes:
+                module_path = entries.get(module_name + suffix)
+                if module_path:
+                    table[f'mars_x.cython_modules.{module_name}'] = module_path
+                    break
         
-        # Try to load all modules
-        for module_name, module_path in module_files:
-            # Try with the specific path
-            if os.path.exists(module_path):
-                full_name = f'mars_x.cython_modules.{module_name}'
-                load_binary_module(full_name, module_path)
-            else:
-                # Try with different extensions
-                for ext in extensions:
-                    generic_path = os.path.join(cython_modules_path, f'{module_name}{ext}')
-                    if os.path.exists(generic_path):
-                        full_name = f'mars_x.cython_modules.{module_name}'
-                        load_binary_module(full_name, generic_path)
-                        break
+        # Ahead of the default finders, so the bundled files win
+        sys.meta_path.insert(0, _CythonBundleFinder(table))
+        print(f"Registered {len(table)} Cython modules for lazy loading")
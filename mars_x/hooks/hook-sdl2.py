@@ -2,6 +2,41 @@
 import os
 import sys
 import ctypes
+import importlib.abc
+
+# Optional SDL2 libraries, loaded only when their pysdl2 module is imported
+LAZY_DLLS = {
+    'sdl2.sdlttf': 'SDL2_ttf.dll',
+    'sdl2.sdlimage': 'SDL2_image.dll',
+    'sdl2.sdlmixer': 'SDL2_mixer.dll',
+}
+
+# File names in the bundle directory, listed once when the hook runs
+BUNDLED_FILES = frozenset()
+
+def load_bundled_dll(dll_name):
+    """Load a DLL from the bundle directory if it is present."""
+    if dll_name in BUNDLED_FILES:
+        ctypes.CDLL(os.path.join(sys._MEIPASS, dll_name))
+        print(f"Loaded {dll_name}")
+
+class _LazySDL2DLLFinder(importlib.abc.MetaPathFinder):
+    """
+    Loads the DLL behind sdl2.sdlttf/sdlimage/sdlmixer the first time the
+    module is imported, then lets the normal import system take over.
+    """
+    
+    def __init__(self, dlls):
+        self._pending = dict(dlls)
+    
+    def find_spec(self, fullname, path, target=None):
+        dll_name = self._pending.pop(fullname, None)
+        if dll_name is not None:
+            try:
+                load_bundled_dll(dll_name)
+            except Exception as e:
+                print(f"Warning: Error loading {dll_name} manually: {e}")
+        return None
 
 # Set SDL2 DLL path BEFORE importing sdl2
 if getattr(sys, 'frozen', False):
@@ -10,14 +45,29 @@ if getattr(sys, 'frozen', False):
     os.environ["PYSDL2_DLL_PATH"] = dll_path
     print(f"Set PYSDL2_DLL_PATH to {dll_path}")
     
-    # Try to manually load the DLLs
-    try:
-        for dll_name in ["SDL2.dll", "SDL2_ttf.dll", "SDL2_image.dll", "SDL2_mixer.dll"]:
-            dll_path = os.path.join(sys._MEIPASS, dll_name)
-            if os.path.exists(dll_path):
-                ctypes.CDLL(dll_path)
-                print(f"Loaded {dll_name}")
-    except Exception as e:
-        print(f"Warning: Error loading SDL2 DLLs manually: {e}")
+    # The bundled SDL2 libraries are Windows DLLs; elsewhere nothing is
+    # bundled and pysdl2 falls back to the system libSDL2
+    if os.name == 'nt':
+        # Put the bundle on the process DLL search list (AddDllDirectory), so
+        # the SDL2 libraries' own dependencies resolve from it with ctypes'
+        # default LoadLibraryEx flags
+        if hasattr(os, 'add_dll_directory'):
+            BUNDLE_DLL_DIRECTORY = os.add_dll_directory(dll_path)
+        
+        # One directory read instead of a stat per DLL
+        with os.scandir(dll_path) as entries:
+            BUNDLED_FILES = frozenset(entry.name for entry in entries if entry.is_file())
+        
+        # Only the core library is needed up front; the game itself uses
+        # SDL_INIT_VIDEO/EVENTS only. A bundle without it cannot start, so
+        # fail here rather than on the first SDL call.
+        if "SDL2.dll" not in BUNDLED_FILES:
+            raise RuntimeError(f"SDL2.dll is missing from the bundle directory {dll_path}")
+        try:
+            load_bundled_dll("SDL2.dll")
+        except Exception as e:
+            print(f"Warning: Error loading SDL2 DLLs manually: {e}")
+        
+        sys.meta_path.insert(0, _LazySDL2DLLFinder(LAZY_DLLS))
 
 # Do not import sdl2 here - it will be imported by the application
@@ -3,58 +3,31 @@ Main entry point for Mars-X game.
 """
 import os
 import sys
+import time
 import logging
-from pathlib import Path
-
-# Import engine components
-from mars_x.engine.window import Window
-from mars_x.engine.input import InputManager
-from mars_x.game.game_world import GameWorld
 
 # Import project constants - direct import with no fallback
 from mars_x.utils.constants import (
     GAME_NAME, DEFAULT_SCREEN_WIDTH, DEFAULT_SCREEN_HEIGHT
 )
+from mars_x.utils import setup_logger
 
-def setup_logger():
-    """Set up logging to write to a file next to the executable."""
-    # Determine the log file location (next to the executable)
-    if getattr(sys, 'frozen', False):
-        # Running as bundled exe
-        base_path = Path(sys.executable).parent
-    else:
-        # Running in development
-        base_path = Path(__file__).resolve().parent.parent
-        
-    log_file = base_path / "mars-x.log"
-    
-    # Configure logging
-    logging.basicConfig(
-        filename=str(log_file),
-        level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Add console handler to print logs to stdout as well
-    console = logging.StreamHandler()
-    console.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(levelname)s: %(message)s')
-    console.setFormatter(formatter)
-    logging.getLogger('').addHandler(console)
-    
-    return log_file
+# Frame pacing: target frame length, and how much of the remaining time is
+# left to a busy-wait rather than SDL_Delay (which wakes up at OS
+# scheduler granularity)
+_FRAME_NS = 1_000_000_000 // 60
+_SPIN_NS = 2_000_000
 
 def main():
     """Main function to test SDL2 initialization."""
     log_file = setup_logger()
     
-    logging.info(f"Starting {GAME_NAME} test... Log file: {log_file}")
-    logging.info(f"Python version: {sys.version}")
-    logging.info(f"Current directory: {os.getcwd()}")
+    logging.info("Starting %s test... Log file: %s", GAME_NAME, log_file)
+    logging.info("Python version: %s", sys.version)
+    logging.info("Current directory: %s", os.getcwd())
 
     # Print environment variables
-    logging.info(f"PYSDL2_DLL_PATH: {os.environ.get('PYSDL2_DLL_PATH', 'not set')}")
+    logging.info("PYSDL2_DLL_PATH: %s", os.environ.get('PYSDL2_DLL_PATH', 'not set'))
     
     try:
         # Try to import and initialize SDL2
@@ -62,21 +35,29 @@ def main():
         import sdl2.ext
         
         logging.info("SDL2 module imported successfully")
-        logging.info(f"SDL2 version: {sdl2.SDL_MAJOR_VERSION}.{sdl2.SDL_MINOR_VERSION}.{sdl2.SDL_PATCHLEVEL}")
+        logging.info("SDL2 version: %d.%d.%d", sdl2.SDL_MAJOR_VERSION, sdl2.SDL_MINOR_VERSION, sdl2.SDL_PATCHLEVEL)
+        
+        # Import engine components only once logging is up, so importing
+        # mars_x.main stays cheap and import failures end up in the log
+        from mars_x.engine.window import Window
+        from mars_x.engine.input import InputManager
+        from mars_x.game.game_world import GameWorld
+        from mars_x.cython_modules.frame import render_frame  # type: ignore
         
-        # Initialize SDL2
+        # Initialize SDL2 (the video subsystem initializes events itself)
         logging.info("Initializing SDL2...")
-        ret = sdl2.SDL_Init(sdl2.SDL_INIT_VIDEO | sdl2.SDL_INIT_EVENTS)
+        ret = sdl2.SDL_Init(sdl2.SDL_INIT_VIDEO)
         if ret != 0:
             error = sdl2.SDL_GetError()
-            logging.error(f"Error initializing SDL2: {error.decode() if hasattr(error, 'decode') else error}")
+            logging.error("Error initializing SDL2: %s", error.decode() if hasattr(error, 'decode') else error)
             return 1
         
         logging.info("SDL2 initialized successfully")
         
-        # Create window using our Window class
+        # Create window using our Window class; the game draws through an
+        # SDL renderer only, so skip the Vulkan window setup
         logging.info("Creating window...")
-        window = Window(GAME_NAME, DEFAULT_SCREEN_WIDTH, DEFAULT_SCREEN_HEIGHT)
+        window = Window(GAME_NAME, DEFAULT_SCREEN_WIDTH, DEFAULT_SCREEN_HEIGHT, vulkan=False)
         
         # Get the SDL window handle for renderer creation
         sdl_window = window.get_sdl_window()
@@ -85,7 +66,7 @@ def main():
         renderer = sdl2.SDL_CreateRenderer(sdl_window, -1, sdl2.SDL_RENDERER_ACCELERATED)
         if not renderer:
             error = sdl2.SDL_GetError()
-            logging.error(f"Error creating renderer: {error.decode() if hasattr(error, 'decode') else error}")
+            logging.error("Error creating renderer: %s", error.decode() if hasattr(error, 'decode') else error)
             window.cleanup()
             sdl2.SDL_Quit()
             return 1
@@ -101,31 +82,68 @@ def main():
         # Main game loop variables
         running = True
         
+        # Frame timing with a nanosecond monotonic clock
+        last_frame_ns = time.perf_counter_ns()
+        frame_target_ns = last_frame_ns + _FRAME_NS
+        delta_time = _FRAME_NS / 1e9
+        
+        # FPS is logged once per accumulated second of frame time
+        fps_accum_ns = 0
+        fps_frames = 0
+        
+        # Actions checked every frame are resolved to IDs once
+        toggle_fullscreen_action = input_manager.resolve_action('toggle_fullscreen')
+        
+        # Bind everything the loop calls every frame to locals, so each call
+        # is a local load instead of a global/attribute lookup
+        perf_counter_ns = time.perf_counter_ns
+        sdl_delay = sdl2.SDL_Delay
+        process_input = input_manager.process_input
+        is_action_id_just_pressed = input_manager.is_action_id_just_pressed
+        update_world = game_world.update
+        
         while running:
             # Process events with our input manager
-            if input_manager.process_input():
+            if process_input():
                 running = False
                 break
             
             # Handle fullscreen toggle with F11 using Window class
-            if input_manager.is_action_just_pressed('toggle_fullscreen'):
+            if is_action_id_just_pressed(toggle_fullscreen_action):
                 is_fullscreen = window.toggle_fullscreen()
-                logging.info(f"Fullscreen toggled to: {is_fullscreen}")
+                logging.info("Fullscreen toggled to: %s", is_fullscreen)
             
             # Update game world (handles all entity updates including player)
-            game_world.update(input_manager, 1/60.0)
+            update_world(input_manager, delta_time)
+            
+            # Clear, let game world render all entities, and present
+            render_frame(renderer, game_world)
             
-            # Clear the renderer
-            sdl2.SDL_SetRenderDrawColor(renderer, 0, 0, 0, 255)
-            sdl2.SDL_RenderClear(renderer)
+            # Sleep through most of the rest of the frame, then spin for the
+            # last slice so the 60 FPS cap is hit without scheduler jitter
+            remaining_ns = frame_target_ns - perf_counter_ns()
+            if remaining_ns > _SPIN_NS:
+                sdl_delay((remaining_ns - _SPIN_NS) // 1_000_000)
+            while perf_counter_ns() < frame_target_ns:
+                pass
             
-            # Let game world render all entities
-            game_world.render()
+            current_ns = perf_counter_ns()
+            frame_ns = current_ns - last_frame_ns
+            delta_time = frame_ns / 1e9
+            last_frame_ns = current_ns
             
-            sdl2.SDL_RenderPresent(renderer)
+            # Schedule the next frame; after a long frame, restart from now
+            # instead of rushing to catch up
+            frame_target_ns += _FRAME_NS
+            if frame_target_ns < current_ns:
+                frame_target_ns = current_ns + _FRAME_NS
             
-            # Small delay to reduce CPU usage
-            sdl2.SDL_Delay(16)  # Roughly 60 FPS
+            fps_accum_ns += frame_ns
+            fps_frames += 1
+            if fps_accum_ns >= 1_000_000_000:
+                logging.debug("FPS: %.1f", fps_frames * 1e9 / fps_accum_ns)
+                fps_accum_ns = 0
+                fps_frames = 0
         
         # Clean up
         sdl2.SDL_DestroyRenderer(renderer)
@@ -136,10 +154,10 @@ def main():
         return 0
     
     except ImportError as e:
-        logging.error(f"Error importing SDL2: {e}")
+        logging.error("Error importing SDL2 or engine modules: %s", e)
         return 1
     except Exception as e:
-        logging.exception(f"Unexpected error: {e}")
+        logging.exception("Unexpected error: %s", e)
         return 1
 
 if __name__ == "__main__":
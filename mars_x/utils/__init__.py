@@ -4,20 +4,26 @@ Mars-X Utilities Package.
 This package contains various utility modules and helper functions used
 throughout the Mars-X project, including constants, setup helpers, and
 other common functionality.
+
+Only the constants are loaded on import; the logging helpers are imported
+on first access (PEP 562).
 """
 
-from .constants import (
-    PROJECT_ROOT, 
-    VENV_DIR, 
-    SOURCE_DIR, 
-    RESOURCES_DIR, 
-    BUILD_DIR,
-    GAME_NAME,
-    GAME_VERSION,
-    GAME_AUTHOR,
-    GAME_DESCRIPTION
-)
+from . import constants
+from .constants import GAME_VERSION as __version__
 
+# Names resolved from the logger submodule on first access
+_LOGGER_EXPORTS = frozenset({'setup_logger', 'stop_logger'})
 
-# Import version information
-__version__ = GAME_VERSION
+def __getattr__(name):
+    """Resolve logging helpers and constants lazily, caching the result."""
+    if name in _LOGGER_EXPORTS:
+        from . import logger
+        value = getattr(logger, name)
+    elif not name.startswith('_') and hasattr(constants, name):
+        value = getattr(constants, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    globals()[name] = value
+    return value
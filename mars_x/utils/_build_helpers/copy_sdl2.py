@@ -0,0 +1,22 @@
+"""
+Copy the pysdl2-dll DLLs into a directory. Usage: copy_sdl2.py <target_dir>
+"""
+import os, sys, shutil, glob
+from sdl2dll import get_dll_path
+
+dll_path = get_dll_path()
+target_dir = sys.argv[1]
+
+dll_files = glob.glob(os.path.join(dll_path, "*.dll"))
+for dll in dll_files:
+    print(f"Copying {os.path.basename(dll)}")
+    dst = os.path.join(target_dir, os.path.basename(dll))
+    if os.path.exists(dst):
+        os.remove(dst)
+    # A hard link moves no data; fall back to a copy across volumes or on
+    # filesystems without hard links
+    try:
+        os.link(dll, dst)
+    except OSError:
+        shutil.copy2(dll, dst)
+print(f"FOUND_DLLS:{target_dir}")
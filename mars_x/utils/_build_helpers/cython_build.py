@@ -0,0 +1,156 @@
+"""
+Build the Cython extensions in place, restoring unchanged modules from
+the build cache. Usage: cython_build.py <build_dir> [--force]
+"""
+import hashlib
+import os
+import shutil
+import sys
+import sysconfig
+
+modules = ["vector", "collision", "rigidbody", "matrix", "quaternion", "input_core", "frame"]
+
+compiler_directives = {
+    'language_level': 3,
+    'boundscheck': False,
+    'wraparound': False,
+    'initializedcheck': False,
+    'infer_types': True,
+    'binding': False,
+    'always_allow_keywords': False
+}
+
+# MSVC's default is already /Ox. -march=native and -ffast-math are left out:
+# the modules ship inside the game bundle and rely on IEEE comparisons
+extra_compile_args = [] if os.name == 'nt' else ['-O3', '-funroll-loops']
+
+# Built modules are cached by source hash, Python and Cython version
+ext_suffix = sysconfig.get_config_var("EXT_SUFFIX")
+py_ver = f"py{sys.version_info[0]}{sys.version_info[1]}"
+pxd_dir = os.path.join("mars_x", "cython_modules")
+
+def source_path(module):
+    return os.path.join(pxd_dir, f"{module}.pyx")
+
+def module_path(module):
+    return os.path.join(pxd_dir, module + ext_suffix)
+
+def cache_path(cache_dir, pxd_files, module, cython_version):
+    digest = hashlib.sha256(repr((compiler_directives, extra_compile_args)).encode())
+    for path in [source_path(module)] + pxd_files:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return os.path.join(cache_dir, f"{module}_{digest.hexdigest()}_{py_ver}_{cython_version}{ext_suffix}")
+
+def up_to_date(module, input_mtime):
+    """True if the in-place module is newer than all of its inputs."""
+    try:
+        built = os.stat(module_path(module)).st_mtime
+    except OSError:
+        return False
+    return built >= max(input_mtime, os.stat(source_path(module)).st_mtime)
+
+def use_compiler_cache():
+    """
+    Wrap the C/C++ compilers with ccache (or sccache), so unchanged
+    generated code is not recompiled. Skipped on Windows, where
+    setuptools' MSVC compiler ignores CC/CXX.
+    """
+    if os.name == 'nt':
+        return
+    launcher = shutil.which("ccache") or shutil.which("sccache")
+    if not launcher:
+        return
+    cc = os.environ.get("CC") or sysconfig.get_config_var("CC") or "cc"
+    cxx = os.environ.get("CXX") or sysconfig.get_config_var("CXX") or "c++"
+    os.environ["CC"] = f"{launcher} {cc}"
+    os.environ["CXX"] = f"{launcher} {cxx}"
+    # Key hits on the compiler binary's contents, not its mtime
+    os.environ.setdefault("CCACHE_COMPILERCHECK", "content")
+    print(f"Using compiler cache: {launcher}")
+
+def main():
+    # --force (a clean build) rebuilds everything regardless of the cache
+    build_dir = sys.argv[1]
+    force = "--force" in sys.argv[2:]
+    cache_dir = os.path.join(build_dir, "cython_cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    # Modules cimport each other, so every .pxd is part of every key
+    pxd_files = sorted(os.path.join(pxd_dir, name) for name in os.listdir(pxd_dir) if name.endswith(".pxd"))
+    
+    # This script holds the directives, so it counts as an input too
+    input_mtime = max(os.stat(path).st_mtime for path in pxd_files + [__file__])
+    
+    # Skip modules untouched since their last build without reading them. When
+    # all are, Cython and setuptools are never imported
+    stale = modules if force else [module for module in modules if not up_to_date(module, input_mtime)]
+    for module in modules:
+        if module not in stale:
+            print(f"Cython up to date: mars_x.cython_modules.{module}")
+    
+    # Restore the other unchanged ones from the cache and compile the rest
+    pending = []
+    if stale:
+        import Cython
+        for module in stale:
+            cached = cache_path(cache_dir, pxd_files, module, Cython.__version__)
+            if not force and os.path.exists(cached):
+                shutil.copy2(cached, module_path(module))
+                # Stamp it now, so the next build takes the mtime early-out
+                os.utime(module_path(module))
+                print(f"Cython cache hit: mars_x.cython_modules.{module}")
+            else:
+                pending.append((module, cached))
+    
+    if pending:
+        from setuptools import Distribution, Extension
+        from Cython.Build import cythonize
+        
+        use_compiler_cache()
+        
+        extensions = [
+            Extension(f"mars_x.cython_modules.{module}", [source_path(module)],
+                      extra_compile_args=extra_compile_args)
+            for module, _ in pending
+        ]
+        
+        # Generate C and compile it on every core
+        jobs = os.cpu_count() or 1
+        dist = Distribution({
+            "name": "mars_x_cython_modules",
+            "ext_modules": cythonize(
+                extensions,
+                nthreads=jobs,
+                compiler_directives=compiler_directives,
+                annotate=False,
+                force=force,
+                # Generated C keyed by each module's own transitive .pxd
+                # dependencies, so a .pxd edit only re-translates its users
+                cache=os.path.join(build_dir, "cythonize_cache")
+            )
+        })
+        
+        # Drive build_ext directly rather than through setup() and sys.argv.
+        # Modules land next to their .pyx; objects and setuptools' staging copy
+        # go to short fixed paths instead of build/temp.<platform>-cpython-<ver>/
+        build_ext = dist.get_command_obj("build_ext")
+        build_ext.inplace = 1
+        build_ext.parallel = jobs
+        build_ext.force = force
+        build_ext.build_temp = os.path.join(build_dir, "tmp")
+        build_ext.build_lib = os.path.join(build_dir, "lib")
+        dist.run_command("build_ext")
+        
+        for module, cached in pending:
+            shutil.copy2(module_path(module), cached)
+    
+    current = len(modules) - len(stale)
+    hits = len(stale) - len(pending)
+    with open(os.path.join(build_dir, "build_log.txt"), "a") as log:
+        log.write(f"Cython cache: {current} up to date, {hits} hits, {len(pending)} misses\n")
+
+# cythonize(nthreads=...) starts worker processes, which re-import this
+# script under spawn (Windows, macOS)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Locate the SDL2 DLLs in the venv and print them as FOUND_DLLS:/DLL: lines.
+"""
+import os, site
+
+def list_dlls(dll_dir):
+    """Names of the DLLs in a directory, from one listing."""
+    try:
+        with os.scandir(dll_dir) as entries:
+            return [entry.name for entry in entries if entry.name.endswith(".dll")]
+    except OSError:
+        return []
+
+def find_sdl2_dlls():
+    # First check if pysdl2-dll package is installed; it knows its own path
+    try:
+        from sdl2dll import get_dll_path
+        dll_path = get_dll_path()
+        dlls = list_dlls(dll_path)
+        if dlls:
+            return dll_path, dlls
+    except ImportError:
+        pass
+    
+    # Otherwise check site-packages in one pass: a pysdl2-dll layout wins,
+    # DLLs next to pysdl2 are kept as the fallback
+    fallback = None, []
+    for site_dir in site.getsitepackages():
+        sdl2dll_path = os.path.join(site_dir, "sdl2dll", "dll")
+        dlls = list_dlls(sdl2dll_path)
+        if dlls:
+            return sdl2dll_path, dlls
+        if fallback[0] is None:
+            sdl2_path = os.path.join(site_dir, "sdl2")
+            dlls = list_dlls(sdl2_path)
+            if dlls:
+                fallback = sdl2_path, dlls
+    
+    return fallback
+
+path, dlls = find_sdl2_dlls()
+if path:
+    print(f"FOUND_DLLS:{path}")
+    for dll in dlls:
+        print(f"DLL:{dll}")
+else:
+    print("NO_DLLS_FOUND")
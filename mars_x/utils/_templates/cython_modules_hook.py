@@ -0,0 +1,34 @@
+# Cython modules runtime hook for PyInstaller
+import os
+import sys
+import importlib.util
+
+def load_cython_module(module_name, module_path):
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        if spec:
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+            return True
+    except Exception as e:
+        print(f"Error loading {module_name} from {module_path}: {e}")
+    return False
+
+if getattr(sys, 'frozen', False):
+    # We're running in a PyInstaller bundle
+    root_path = sys._MEIPASS
+    
+    # Try to load Cython modules directly from their binary locations
+    cython_modules_path = os.path.join(root_path, "mars_x", "cython_modules")
+    if os.path.exists(cython_modules_path):
+        print(f"Found Cython modules directory: {cython_modules_path}")
+        
+        # Make sure mars_x is in sys.modules
+        if 'mars_x' not in sys.modules:
+            import mars_x
+            
+        # Make sure mars_x.cython_modules is in sys.modules
+        if 'mars_x.cython_modules' not in sys.modules:
+            import types
+            sys.modules['mars_x.cython_modules'] = types.ModuleType('mars_x.cython_modules')
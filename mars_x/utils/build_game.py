@@ -7,23 +7,68 @@ import os
 import sys
 import subprocess
 import re
+import json
+import hashlib
+import importlib
+import importlib.metadata
+import importlib.util
 import shutil
 from pathlib import Path
 import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Path constants - now defined relative to this file's location
 UTILS_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = UTILS_DIR.parent.parent
 VENV_DIR = PROJECT_ROOT / ".venv"
 BUILD_DIR = PROJECT_ROOT / "build"
+HELPERS_DIR = UTILS_DIR / "_build_helpers"
+TEMPLATES_DIR = UTILS_DIR / "_templates"  # Default runtime hooks
+
+# SDL2 DLL location found by the last build, reused while the venv is unchanged
+SDL2_CACHE = BUILD_DIR / "sdl2_cache.json"
+
+# Installed packages (pip freeze) after the last full requirements install
+FREEZE_SNAPSHOT = VENV_DIR / ".requirements.freeze"
+
+# Platform-dependent names, resolved once
+IS_WINDOWS = os.name == 'nt'
+PYTHON_EXE = VENV_DIR / ("Scripts/python.exe" if IS_WINDOWS else "bin/python")
+EXE_NAME = "mars-x.exe" if IS_WINDOWS else "mars-x"
+PATH_SEP = ";" if IS_WINDOWS else ":"  # PyInstaller's --add-data/--add-binary separator
+
+# Extra subprocess arguments for children whose output is fully redirected:
+# on Windows they need no console of their own (no conhost.exe per spawn).
+# Children writing straight to our console must not get this, or their
+# output is lost
+NO_WINDOW = {"creationflags": subprocess.CREATE_NO_WINDOW} if IS_WINDOWS else {}
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
 
 def format_size(size_bytes):
     """Format size in bytes to a human-readable string."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024 or unit == 'GB':
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024
+    # Each unit is 10 more bits; pick it from the bit length instead of
+    # dividing in a loop
+    unit = min(3, (size_bytes.bit_length() - 1) // 10) if size_bytes > 0 else 0
+    return f"{size_bytes / (1 << (10 * unit)):.2f} {_SIZE_UNITS[unit]}"
+
+def tree_size(path):
+    """
+    Total size in bytes of the files under a directory. Walks with an
+    explicit stack of os.scandir listings; on Windows the sizes come with
+    the listing, so no file is stat'ed separately.
+    """
+    total = 0
+    pending = [path]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total
 
 def format_time(seconds):
     """Format time in seconds to a human-readable string."""
@@ -38,8 +83,97 @@ def format_time(seconds):
         minutes = int((seconds % 3600) // 60)
         return f"{hours} hr {minutes} min"
 
-def build_game():
-    """Build the game executable."""
+def probe_modules(python_exe, modules):
+    """
+    Return {module: installed} for the venv interpreter. Checked in process
+    when this script already runs on it (as 'setup.py --build' does),
+    otherwise from one subprocess.
+    """
+    if os.path.normcase(os.path.abspath(python_exe)) == os.path.normcase(os.path.abspath(sys.executable)):
+        return {m: importlib.util.find_spec(m) is not None for m in modules}
+    
+    probe = (
+        "import importlib.util, json, sys; "
+        "print(json.dumps({m: importlib.util.find_spec(m) is not None for m in sys.argv[1:]}))"
+    )
+    result = subprocess.run(
+        [str(python_exe), "-c", probe, *modules],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        check=False,
+        **NO_WINDOW
+    )
+    try:
+        return json.loads(result.stdout)
+    except ValueError:
+        return dict.fromkeys(modules, False)
+
+def load_sdl2_cache():
+    """
+    Return the cached (dll_dir, dll_names) if it was written for the current
+    venv interpreter and every DLL is still there, else None.
+    """
+    try:
+        cache = json.loads(SDL2_CACHE.read_text())
+        if cache["python_mtime"] != os.path.getmtime(PYTHON_EXE):
+            return None
+        dll_dir, dlls = cache["dll_path"], cache["dlls"]
+    except (OSError, ValueError, KeyError):
+        return None
+    if not dlls or not all(os.path.exists(os.path.join(dll_dir, dll)) for dll in dlls):
+        return None
+    return dll_dir, dlls
+
+def save_sdl2_cache(dll_dir, dlls):
+    """Remember where the SDL2 DLLs were found for the next build."""
+    SDL2_CACHE.write_text(json.dumps({
+        "python_mtime": os.path.getmtime(PYTHON_EXE),
+        "dll_path": dll_dir,
+        "dlls": dlls,
+    }))
+
+def requirement_names(lines):
+    """Normalized project names from requirements / pip freeze lines."""
+    names = set()
+    for line in lines:
+        match = re.match(r"[A-Za-z0-9][A-Za-z0-9._-]*", line.strip())
+        if match:
+            names.add(re.sub(r"[-_.]+", "-", match.group(0)).lower())
+    return names
+
+def only_pins_changed(req_file):
+    """
+    True when every package in requirements.txt was already installed by
+    the last full install, so a changed file can only have moved versions
+    and pip can skip dependency resolution.
+    """
+    if not FREEZE_SNAPSHOT.exists():
+        return False
+    installed = requirement_names(FREEZE_SNAPSHOT.read_text().splitlines())
+    return requirement_names(req_file.read_text().splitlines()) <= installed
+
+def run_logged(cmd, log_path):
+    """
+    Run a command, echoing its combined output line by line and appending
+    it to the log file in the same pass. Raises CalledProcessError on
+    failure, like subprocess.run(check=True).
+    """
+    with open(log_path, "a") as log:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              bufsize=1, text=True, **NO_WINDOW) as proc:
+            for line in proc.stdout:
+                print(line, end="")
+                log.write(line)
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+def build_game(clean=False):
+    """
+    Build the game executable.
+    PyInstaller's work directory and the Cython cache are kept between
+    builds; clean=True removes them first for a full rebuild.
+    """
     # Start timer for build telemetry
     build_start = datetime.datetime.now()
     build_start_time = time.time()
@@ -47,14 +181,27 @@ def build_game():
     
     # Create a build log file
     build_log_path = BUILD_DIR / "build_log.txt"
-    if not BUILD_DIR.exists():
-        os.makedirs(BUILD_DIR)
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
     
     # Log initial build information
     with open(build_log_path, "a") as log:
         log.write(f"\n\n--- Build started at {build_start.strftime('%Y-%m-%d %H:%M:%S')} ---\n")
+        if clean:
+            log.write("Clean build: PyInstaller work directory and Cython cache removed\n")
+        else:
+            log.write("Incremental build: reusing cached analysis "
+                      "('python setup.py --build --clean' forces a full rebuild)\n")
+    
+    if clean:
+        for cache_dir in (BUILD_DIR / "mars-x", BUILD_DIR / "cython_cache", BUILD_DIR / "cythonize_cache",
+                          BUILD_DIR / "tmp", BUILD_DIR / "lib"):
+            if cache_dir.exists():
+                print(f"Removing {cache_dir}")
+                shutil.rmtree(cache_dir)
     
     # Check if virtual environment exists, if not create it
+    req_file = PROJECT_ROOT / "requirements.txt"
+    req_hash = None
     if not VENV_DIR.exists():
         print("Virtual environment not found. Creating one first...")
         # Import and call manage_venv from setup.py
@@ -62,55 +209,79 @@ def build_game():
         from setup import manage_venv
         manage_venv()
     else:
-        # Make sure we have the latest requirements
-        print("Updating dependencies in existing virtual environment...")
-        if os.name == 'nt':
-            python_exe = VENV_DIR / "Scripts" / "python.exe"
-        else:
-            python_exe = VENV_DIR / "bin" / "python"
-        
-        req_file = PROJECT_ROOT / "requirements.txt"
-        subprocess.run([str(python_exe), "-m", "pip", "install", "-r", str(req_file)], check=True)
-    
-    # Get the Python executable from the virtual environment
-    if os.name == 'nt':
-        python_exe = VENV_DIR / "Scripts" / "python.exe"
-    else:
-        python_exe = VENV_DIR / "bin" / "python"
+        # Reinstall requirements only when requirements.txt changed since
+        # the last install
+        req_hash = hashlib.sha256(req_file.read_bytes()).hexdigest()
+        req_stamp = VENV_DIR / ".requirements.sha256"
+        if req_stamp.exists() and req_stamp.read_text().strip() == req_hash:
+            print("Requirements unchanged since the last install")
+            req_hash = None
     
-    if not python_exe.exists():
-        print(f"Error: Python executable not found at {python_exe}")
+    # Check the Python executable in the virtual environment
+    if not PYTHON_EXE.exists():
+        print(f"Error: Python executable not found at {PYTHON_EXE}")
         print("The virtual environment appears to be corrupted.")
         print("Please delete it and run 'python setup.py' again.")
         sys.exit(1)
 
-    # Create build directory if it doesn't exist
-    if not BUILD_DIR.exists():
-        os.makedirs(BUILD_DIR)
-    
     # Create resources directory if it doesn't exist
     resources_dir = PROJECT_ROOT / "resources"
-    if not resources_dir.exists():
-        print("Creating resources directory...")
-        os.makedirs(resources_dir)
+    resources_dir.mkdir(parents=True, exist_ok=True)
     
     print("Building game executable...")
     
-    # First, compile Cython modules
-    print("Compiling Cython modules...")
-    try:
-        # Check if cython is installed before installing
-        result = subprocess.run(
-            [str(python_exe), "-c", "import cython; print('installed')"],
+    # Check the build tools in the venv with a single interpreter launch,
+    # then install whatever is missing together with any changed
+    # requirements in one pip run
+    build_packages = {"cython": "cython", "PyInstaller": "pyinstaller", "sdl2dll": "pysdl2-dll"}
+    installed = probe_modules(PYTHON_EXE, list(build_packages))
+    missing = [package for module, package in build_packages.items() if not installed[module]]
+    if missing or req_hash:
+        pip_cmd = [str(PYTHON_EXE), "-m", "pip", "install", *missing]
+        # Version bumps of already-installed packages skip the resolver;
+        # new packages get a full install
+        no_deps = bool(req_hash) and not missing and only_pins_changed(req_file)
+        if req_hash:
+            pip_cmd += ["-r", str(req_file)]
+        if no_deps:
+            pip_cmd.append("--no-deps")
+        print("Installing dependencies:", " ".join(pip_cmd[4:]))
+        try:
+            subprocess.run(pip_cmd, check=True)
+            if req_hash and not no_deps:
+                # This script runs on the venv interpreter (see __main__),
+                # so read the installed set in process instead of pip freeze
+                importlib.invalidate_caches()
+                FREEZE_SNAPSHOT.write_text("".join(
+                    f"{dist.metadata['Name']}=={dist.version}\n"
+                    for dist in importlib.metadata.distributions()
+                ))
+        except subprocess.CalledProcessError as e:
+            print(f"Error installing dependencies: {e}")
+            sys.exit(1)
+        if req_hash:
+            req_stamp.write_text(req_hash)
+    
+    # Reuse the last build's SDL2 DLL location unless the venv changed
+    sdl2_cached = None if (missing or req_hash) else load_sdl2_cache()
+    
+    # SDL2 DLL discovery does not depend on the Cython build; run it in the
+    # background so it overlaps with the C compile
+    if sdl2_cached is None:
+        dll_executor = ThreadPoolExecutor(max_workers=1)
+        dll_future = dll_executor.submit(
+            subprocess.run,
+            [str(PYTHON_EXE), str(HELPERS_DIR / "find_sdl2.py")],
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            check=False
+            check=False,
+            **NO_WINDOW
         )
-        if "installed" not in result.stdout:
-            print("Installing Cython...")
-            subprocess.run([str(python_exe), "-m", "pip", "install", "cython"], check=True)
-            
+    
+    # First, compile Cython modules
+    print("Compiling Cython modules...")
+    try:
         # Compile the cython_modules first - this is critical
         print("Compiling critical Cython modules...")
         cython_critical_modules = [
@@ -118,64 +289,43 @@ def build_game():
             "mars_x/cython_modules/collision.pyx",
             "mars_x/cython_modules/rigidbody.pyx",
             "mars_x/cython_modules/matrix.pyx",
-            "mars_x/cython_modules/quaternion.pyx"
+            "mars_x/cython_modules/quaternion.pyx",
+            "mars_x/cython_modules/input_core.pyx",
+            "mars_x/cython_modules/frame.pyx"
         ]
         
-        # First, Cythonize the modules
+        # Make sure every source is present; cythonize() below does the
+        # code generation for all of them in one pass
         for pyx_file in cython_critical_modules:
-            if os.path.exists(os.path.join(PROJECT_ROOT, pyx_file)):
-                print(f"Cythonizing {pyx_file}")
-                subprocess.run([
-                    str(python_exe), "-m", "cython", 
-                    "-3", "--cplus", os.path.join(PROJECT_ROOT, pyx_file)
-                ], check=True)
-                build_files_count += 1
+            if not os.path.exists(os.path.join(PROJECT_ROOT, pyx_file)):
+                print(f"Error: Cython source not found: {pyx_file}")
+                sys.exit(1)
         
-        # Build Cython modules directly without creating a temporary file
+        # Build Cython modules with the helper script (sources are relative
+        # to the project root)
         print("Building Cython extensions...")
-        cython_build_cmd = """
-import sys
-from setuptools import setup, Extension
-from Cython.Build import cythonize
-
-extensions = [
-    Extension("mars_x.cython_modules.vector", ["mars_x/cython_modules/vector.pyx"]),
-    Extension("mars_x.cython_modules.collision", ["mars_x/cython_modules/collision.pyx"]),
-    Extension("mars_x.cython_modules.rigidbody", ["mars_x/cython_modules/rigidbody.pyx"]),
-    Extension("mars_x.cython_modules.matrix", ["mars_x/cython_modules/matrix.pyx"]),
-    Extension("mars_x.cython_modules.quaternion", ["mars_x/cython_modules/quaternion.pyx"])
-]
-
-sys.argv = [sys.argv[0], 'build_ext', '--inplace']
-
-setup(
-    name="mars_x_cython_modules",
-    ext_modules=cythonize(
-        extensions,
-        compiler_directives={
-            'language_level': 3,
-            'boundscheck': False,
-            'wraparound': False
-        }
-    )
-)
-"""
-        # Run the Cython build command directly
-        subprocess.run([str(python_exe), "-c", cython_build_cmd], check=True)
+        subprocess.run(
+            [str(PYTHON_EXE), str(HELPERS_DIR / "cython_build.py"), str(BUILD_DIR),
+             *(["--force"] if clean else [])],
+            cwd=PROJECT_ROOT,
+            check=True
+        )
+        build_files_count += len(cython_critical_modules)
         
         # Identify compiled binary modules to include in PyInstaller
         cython_binaries = []
         cython_dir = PROJECT_ROOT / "mars_x" / "cython_modules"
         
         # Find all compiled binary modules (.pyd on Windows, .so on other platforms)
-        binary_extensions = ['.pyd'] if os.name == 'nt' else ['.so']
-        for ext in binary_extensions:
-            for binary_file in cython_dir.glob(f"*{ext}"):
-                rel_path = os.path.relpath(binary_file, PROJECT_ROOT)
-                # This is critical: We need the destination to be the same directory structure
-                destination = os.path.dirname(rel_path)
-                cython_binaries.append((str(binary_file), destination))
-                print(f"Found Cython binary: {binary_file} -> {destination}")
+        # in one directory read. This is critical: the destination must keep
+        # the same directory structure
+        binary_extension = '.pyd' if IS_WINDOWS else '.so'
+        destination = os.path.join("mars_x", "cython_modules")
+        with os.scandir(cython_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(binary_extension) and entry.is_file():
+                    cython_binaries.append((entry.path, destination))
+                    print(f"Found Cython binary: {entry.path} -> {destination}")
         
     except subprocess.CalledProcessError as e:
         print(f"Error compiling Cython modules: {e}")
@@ -184,82 +334,27 @@ setup(
     # Then, build executable with PyInstaller
     print("Building executable with PyInstaller...")
     try:
-        # Check if pyinstaller is installed before installing
-        result = subprocess.run(
-            [str(python_exe), "-c", "import PyInstaller; print('installed')"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=False
-        )
-        if "installed" not in result.stdout:
-            print("Installing PyInstaller...")
-            subprocess.run([str(python_exe), "-m", "pip", "install", "pyinstaller"], check=True)
-        
-        # Find the SDL2 DLL files directly - improving the detection
         print("Locating SDL2 libraries...")
-        sdl2_dll_cmd = """
-import os, sys, glob, site
-
-def find_sdl2_dlls():
-    # First check if pysdl2-dll package is installed
-    try:
-        # Try direct approach with sdl2dll
-        from sdl2dll import get_dll_path
-        dll_path = get_dll_path()
-        dlls = glob.glob(os.path.join(dll_path, "*.dll"))
-        if dlls:
-            return dll_path, [os.path.basename(dll) for dll in dlls]
-    except ImportError:
-        pass
-    
-    # Try alternate approach - check site-packages/sdl2dll
-    for site_dir in site.getsitepackages():
-        sdl2dll_path = os.path.join(site_dir, "sdl2dll", "dll")
-        if os.path.exists(sdl2dll_path):
-            dlls = glob.glob(os.path.join(sdl2dll_path, "*.dll"))
-            if dlls:
-                return sdl2dll_path, [os.path.basename(dll) for dll in dlls]
-    
-    # Check other common locations
-    for site_dir in site.getsitepackages():
-        # Look for SDL2 DLLs in pysdl2 directory
-        sdl2_path = os.path.join(site_dir, "sdl2")
-        if os.path.exists(sdl2_path):
-            dlls = glob.glob(os.path.join(sdl2_path, "*.dll"))
-            if dlls:
-                return sdl2_path, [os.path.basename(dll) for dll in dlls]
-    
-    return None, []
-
-path, dlls = find_sdl2_dlls()
-if path:
-    print(f"FOUND_DLLS:{path}")
-    for dll in dlls:
-        print(f"DLL:{dll}")
-else:
-    print("NO_DLLS_FOUND")
-"""
-        result = subprocess.run(
-            [str(python_exe), "-c", sdl2_dll_cmd],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=False
-        )
-        
         sdl2_dll_path = None
         sdl2_dlls = []
         
-        for line in result.stdout.splitlines():
-            line = line.strip()
-            if line.startswith("FOUND_DLLS:"):
-                sdl2_dll_path = line[11:].strip()
-                print(f"Found SDL2 DLL directory: {sdl2_dll_path}")
-            elif line.startswith("DLL:"):
-                dll_name = line[4:].strip()
-                sdl2_dlls.append(dll_name)
-                print(f"Found SDL2 DLL: {dll_name}")
+        if sdl2_cached is not None:
+            sdl2_dll_path, sdl2_dlls = sdl2_cached
+            print(f"Using cached SDL2 DLL directory: {sdl2_dll_path}")
+        else:
+            # Collect the SDL2 DLL discovery started before the Cython build
+            result = dll_future.result()
+            dll_executor.shutdown()
+            
+            for line in result.stdout.splitlines():
+                line = line.strip()
+                if line.startswith("FOUND_DLLS:"):
+                    sdl2_dll_path = line[11:].strip()
+                    print(f"Found SDL2 DLL directory: {sdl2_dll_path}")
+                elif line.startswith("DLL:"):
+                    dll_name = line[4:].strip()
+                    sdl2_dlls.append(dll_name)
+                    print(f"Found SDL2 DLL: {dll_name}")
         
         # If no DLLs found through script, try downloading them directly
         if not sdl2_dll_path or not sdl2_dlls:
@@ -267,32 +362,18 @@ else:
             try:
                 # Create a directory for SDL2 DLLs
                 sdl2_dir = PROJECT_ROOT / "build" / "sdl2_dlls"
-                if not os.path.exists(sdl2_dir):
-                    os.makedirs(sdl2_dir)
-                
-                # Install pysdl2-dll to get the DLLs
-                subprocess.run([str(python_exe), "-m", "pip", "install", "--upgrade", "pysdl2-dll"], check=True)
+                sdl2_dir.mkdir(parents=True, exist_ok=True)
                 
+                # pysdl2-dll is already in the venv: the dependency step above
+                # installs it when missing, so there is no pip run here
                 # Try to copy the DLLs to our directory
-                copy_dlls_cmd = f"""
-import os, sys, shutil, glob
-from sdl2dll import get_dll_path
-
-dll_path = get_dll_path()
-target_dir = r"{sdl2_dir}"
-
-dll_files = glob.glob(os.path.join(dll_path, "*.dll"))
-for dll in dll_files:
-    print(f"Copying {{os.path.basename(dll)}}")
-    shutil.copy2(dll, os.path.join(target_dir, os.path.basename(dll)))
-print(f"FOUND_DLLS:{{target_dir}}")
-"""
                 dll_result = subprocess.run(
-                    [str(python_exe), "-c", copy_dlls_cmd],
+                    [str(PYTHON_EXE), str(HELPERS_DIR / "copy_sdl2.py"), str(sdl2_dir)],
                     stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
                     text=True,
-                    check=False
+                    check=False,
+                    **NO_WINDOW
                 )
                 
                 # Check if we found DLLs now
@@ -309,83 +390,24 @@ print(f"FOUND_DLLS:{{target_dir}}")
                                     print(f"Found SDL2 DLL: {dll_file}")
             except Exception as e:
                 print(f"Failed to download SDL2 DLLs: {e}")
+        
+        if sdl2_cached is None and sdl2_dll_path and sdl2_dlls:
+            save_sdl2_cache(sdl2_dll_path, sdl2_dlls)
                 
         # Create a better runtime hook file for SDL2
         runtime_hooks_dir = PROJECT_ROOT / "mars_x" / "hooks"
-        if not runtime_hooks_dir.exists():
-            os.makedirs(runtime_hooks_dir)
+        runtime_hooks_dir.mkdir(parents=True, exist_ok=True)
             
         sdl2_hook_file = runtime_hooks_dir / "hook-sdl2.py"
         if not sdl2_hook_file.exists():
-            with open(sdl2_hook_file, "w") as f:
-                f.write("""
-# SDL2 runtime hook for PyInstaller
-import os
-import sys
-import ctypes
-
-# Set SDL2 DLL path BEFORE importing sdl2
-if getattr(sys, 'frozen', False):
-    # We're running in a PyInstaller bundle
-    dll_path = sys._MEIPASS
-    os.environ["PYSDL2_DLL_PATH"] = dll_path
-    print(f"Set PYSDL2_DLL_PATH to {dll_path}")
-    
-    # Try to manually load the DLLs
-    try:
-        for dll_name in ["SDL2.dll", "SDL2_ttf.dll", "SDL2_image.dll", "SDL2_mixer.dll"]:
-            dll_path = os.path.join(sys._MEIPASS, dll_name)
-            if os.path.exists(dll_path):
-                ctypes.CDLL(dll_path)
-                print(f"Loaded {dll_name}")
-    except Exception as e:
-        print(f"Warning: Error loading SDL2 DLLs manually: {e}")
-
-# Do not import sdl2 here - it will be imported by the application
-""")
+            shutil.copyfile(TEMPLATES_DIR / "sdl2_hook.py", sdl2_hook_file)
 
         # Create a better runtime hook file for Cython modules
         cython_hook_file = runtime_hooks_dir / "hook-cython_modules.py"
         
         # Only create it if it doesn't exist already
         if not cython_hook_file.exists():
-            with open(cython_hook_file, "w") as f:
-                f.write("""
-# Cython modules runtime hook for PyInstaller
-import os
-import sys
-import importlib.util
-
-def load_cython_module(module_name, module_path):
-    try:
-        spec = importlib.util.spec_from_file_location(module_name, module_path)
-        if spec:
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
-            return True
-    except Exception as e:
-        print(f"Error loading {module_name} from {module_path}: {e}")
-    return False
-
-if getattr(sys, 'frozen', False):
-    # We're running in a PyInstaller bundle
-    root_path = sys._MEIPASS
-    
-    # Try to load Cython modules directly from their binary locations
-    cython_modules_path = os.path.join(root_path, "mars_x", "cython_modules")
-    if os.path.exists(cython_modules_path):
-        print(f"Found Cython modules directory: {cython_modules_path}")
-        
-        # Make sure mars_x is in sys.modules
-        if 'mars_x' not in sys.modules:
-            import mars_x
-            
-        # Make sure mars_x.cython_modules is in sys.modules
-        if 'mars_x.cython_modules' not in sys.modules:
-            import types
-            sys.modules['mars_x.cython_modules'] = types.ModuleType('mars_x.cython_modules')
-""")
+            shutil.copyfile(TEMPLATES_DIR / "cython_modules_hook.py", cython_hook_file)
 
         # Add binary-specific options
         binaries = []
@@ -405,98 +427,114 @@ if getattr(sys, 'frozen', False):
 
         # Create spec file in the BUILD_DIR instead of project root
         spec_file = BUILD_DIR / "mars-x.spec"
-        if not spec_file.exists():
-            # Handle resources path correctly
-            resources_path = str(resources_dir)
-            resources_target = "resources"
-            
-            if os.name == 'nt':  # Windows
-                resources_arg = f"{resources_path};{resources_target}"
-            else:  # Unix/Linux/Mac
-                resources_arg = f"{resources_path}:{resources_target}"
-            
-            # Build PyInstaller command with all necessary options
-            pyinstaller_cmd = [
-                str(python_exe), "-m", "PyInstaller",
-                "--name=mars-x",
-                "--onefile",
-                "--specpath", str(BUILD_DIR),  # Specify spec file location
-                # Change --windowed to --console to see output
-                "--console",  # Show console window for debugging
-                "--add-data", resources_arg,
-                "--runtime-hook", str(sdl2_hook_file),
-                "--runtime-hook", str(cython_hook_file),
-                "--hidden-import", "sdl2.dll",
-                "--hidden-import", "sdl2.sdlttf",
-                "--hidden-import", "sdl2.sdlimage",
-                "--hidden-import", "sdl2.sdlmixer",
-                "--hidden-import", "ctypes",  # Added ctypes which is needed
-                "--hidden-import", "mars_x.cython_modules.rigidbody",
-                "--hidden-import", "mars_x.cython_modules.vector", 
-                "--hidden-import", "mars_x.cython_modules.collision",
-                "--hidden-import", "mars_x.cython_modules.matrix",
-                "--hidden-import", "mars_x.cython_modules.quaternion",
-            ]
-            
-            # Add all binaries
-            for src, dst in binaries:
-                pyinstaller_cmd.extend(["--add-binary", f"{src};{dst}" if os.name == 'nt' else f"{src}:{dst}"])
-            
-            # Add the main script
-            pyinstaller_cmd.append(str(PROJECT_ROOT / "mars_x" / "main.py"))
-            
+        spec_sig_file = BUILD_DIR / "mars-x.spec.sig"
+        
+        # Handle resources path correctly
+        resources_arg = f"{resources_dir}{PATH_SEP}resources"
+        
+        # Build PyInstaller command with all necessary options
+        pyinstaller_cmd = [
+            str(PYTHON_EXE), "-m", "PyInstaller",
+            "--noconfirm",  # Never stop to ask before replacing dist/
+            "--name=mars-x",
+            "--onedir",  # No self-extraction to a temp dir on every launch
+            "--specpath", str(BUILD_DIR),  # Specify spec file location
+            # Change --windowed to --console to see output
+            "--console",  # Show console window for debugging
+            "--add-data", resources_arg,
+            "--runtime-hook", str(sdl2_hook_file),
+            "--runtime-hook", str(cython_hook_file),
+            "--hidden-import", "sdl2.dll",
+            "--hidden-import", "sdl2.sdlttf",
+            "--hidden-import", "sdl2.sdlimage",
+            "--hidden-import", "sdl2.sdlmixer",
+            "--hidden-import", "ctypes",  # Added ctypes which is needed
+            "--hidden-import", "mars_x.cython_modules.rigidbody",
+            "--hidden-import", "mars_x.cython_modules.vector", 
+            "--hidden-import", "mars_x.cython_modules.collision",
+            "--hidden-import", "mars_x.cython_modules.matrix",
+            "--hidden-import", "mars_x.cython_modules.quaternion",
+            "--hidden-import", "mars_x.cython_modules.input_core",
+            "--hidden-import", "mars_x.cython_modules.frame",
+            "--hidden-import", "mars_x.utils.constants",
+            "--hidden-import", "mars_x.utils.logger",
+        ]
+        
+        # Add all binaries
+        for src, dst in binaries:
+            pyinstaller_cmd.extend(["--add-binary", f"{src}{PATH_SEP}{dst}"])
+        
+        # Add the main script
+        pyinstaller_cmd.append(str(PROJECT_ROOT / "mars_x" / "main.py"))
+        
+        # The spec bakes in the options, binaries and hooks; it is stale when
+        # any of them changed (or it predates the signature, e.g. --onefile)
+        spec_sig = hashlib.sha256(json.dumps({
+            "cmd": pyinstaller_cmd,
+            "hooks": [os.path.getmtime(sdl2_hook_file), os.path.getmtime(cython_hook_file)]
+        }).encode()).hexdigest()
+        spec_current = (
+            spec_file.exists() and spec_sig_file.exists()
+            and spec_sig_file.read_text() == spec_sig
+        )
+        
+        if not spec_current:
             # Run PyInstaller
             print("Running PyInstaller with these options:")
             print(" ".join(pyinstaller_cmd))
-            subprocess.run(pyinstaller_cmd, check=True)
+            run_logged(pyinstaller_cmd, build_log_path)
+            spec_sig_file.write_text(spec_sig)
         else:
             # Use existing spec file from the build directory
             print(f"Using existing spec file: {spec_file}")
-            subprocess.run(
-                [str(python_exe), "-m", "PyInstaller", str(spec_file)],
-                check=True
-            )
+            run_logged([str(PYTHON_EXE), "-m", "PyInstaller", "--noconfirm", str(spec_file)], build_log_path)
         
         # Move built executable to build directory
-        if os.name == 'nt':
-            exe_name = "mars-x.exe"
-        else:
-            exe_name = "mars-x"
-            
-        dist_exe = PROJECT_ROOT / "dist" / exe_name
+        dist_dir = PROJECT_ROOT / "dist" / "mars-x"
+        dist_exe = dist_dir / EXE_NAME
         warn_file = PROJECT_ROOT / "build" / "mars-x" / "warn-mars-x.txt"
         
         if dist_exe.exists():
-            target_path = BUILD_DIR / exe_name
-            shutil.copy2(dist_exe, target_path)
+            # The executable runs from its bundle directory, so move all of
+            # it; a rename on the same filesystem instead of a byte copy.
+            # os.replace cannot overwrite a non-empty directory, so drop the
+            # previous build first
+            app_dir = BUILD_DIR / "game"
+            if app_dir.exists():
+                shutil.rmtree(app_dir)
+            os.replace(dist_dir, app_dir)
+            target_path = app_dir / EXE_NAME
             
             # Calculate build telemetry data
             build_end_time = time.time()
             build_end = datetime.datetime.now()
             build_duration = build_end_time - build_start_time
             
-            # Get executable size and format it
-            exe_size = os.path.getsize(target_path)
+            # Get the bundle size and format it
+            exe_size = tree_size(app_dir)
             size_str = format_size(exe_size)
             
             # Create a telemetry section in the build log
-            with open(build_log_path, "a") as log:
-                log.write(f"Build completed at: {build_end.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                log.write(f"Build duration: {format_time(build_duration)}\n")
-                log.write(f"Executable size: {size_str} ({exe_size:,} bytes)\n")
-                log.write(f"Files processed: {build_files_count}\n")
+            # One buffered write for the summary; the warnings file is
+            # streamed across instead of being read into memory
+            with open(build_log_path, "a", buffering=1 << 16) as log:
+                log.write(
+                    f"Build completed at: {build_end.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                    f"Build duration: {format_time(build_duration)}\n"
+                    f"Bundle size: {size_str} ({exe_size:,} bytes)\n"
+                    f"Files processed: {build_files_count}\n"
+                )
                 if warn_file.exists():
-                    with open(warn_file, "r") as wf:
-                        warnings = wf.read()
                     log.write("\n--- Build Warnings ---\n")
-                    log.write(warnings)
+                    with open(warn_file, "r") as wf:
+                        shutil.copyfileobj(wf, log)
             
             # Display build summary
             print("\n" + "="*50)
             print(" BUILD SUMMARY ".center(50, "="))
             print("="*50)
             print(f"Build time:      {format_time(build_duration)}")
-            print(f"Executable size: {size_str}")
+            print(f"Bundle size:     {size_str}")
             print(f"Files processed: {build_files_count}")
             print(f"Build log:       {build_log_path}")
             print("="*50 + "\n")
@@ -508,12 +546,8 @@ if getattr(sys, 'frozen', False):
             if os.path.exists(PROJECT_ROOT / "dist"):
                 shutil.rmtree(PROJECT_ROOT / "dist")
             
-            # Don't delete the main build directory, just PyInstaller's temp files
-            pyinstaller_build = PROJECT_ROOT / "build" / "mars-x"
-            if os.path.exists(pyinstaller_build):
-                shutil.rmtree(pyinstaller_build)
-            
-            # Keep the spec file for future builds
+            # Keep PyInstaller's work directory (build/mars-x) and the spec
+            # file, so the next build reuses the cached analysis
         else:
             print(f"Error: Expected executable not found at {dist_exe}")
             sys.exit(1)
@@ -521,19 +555,32 @@ if getattr(sys, 'frozen', False):
         print(f"Error building executable: {e}")
         sys.exit(1)
 
-    print(f"\nBuild completed successfully. Executable available at: {BUILD_DIR / exe_name}")
+    print(f"\nBuild completed successfully. Executable available at: {target_path}")
     print("\nRun the game directly from the build directory or use 'python setup.py --build' to rebuild.")
     
     # Offer to run the executable
-    if os.name == 'nt':  # Only on Windows for now
+    if IS_WINDOWS:  # Only on Windows for now
         run_exe = input("Would you like to run the executable now? (y/n): ")
         if run_exe.lower().startswith('y'):
             try:
-                subprocess.Popen([str(BUILD_DIR / exe_name)])
+                subprocess.Popen([str(target_path)])
                 print("Application started.")
             except Exception as e:
                 print(f"Error starting application: {e}")
 
 # Allow direct execution of this script
+def in_venv():
+    """True if this interpreter is the project venv's."""
+    return os.path.normcase(os.path.realpath(sys.prefix)) == os.path.normcase(os.path.realpath(VENV_DIR))
+
 if __name__ == "__main__":
-    build_game()
+    # Re-enter under the venv interpreter, so the build tools can be
+    # checked and used in process instead of from a fresh interpreter
+    if not in_venv() and PYTHON_EXE.exists():
+        argv = [str(PYTHON_EXE), __file__, *sys.argv[1:]]
+        if IS_WINDOWS:
+            # os.execv on Windows starts a new process and returns at once,
+            # which would let the caller continue before the build is done
+            sys.exit(subprocess.run(argv).returncode)
+        os.execv(argv[0], argv)
+    build_game(clean='--clean' in sys.argv)
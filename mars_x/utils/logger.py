@@ -0,0 +1,74 @@
+"""
+Logging setup for Mars-X: a queued file and console log.
+"""
+
+import atexit
+import functools
+import logging
+import logging.handlers
+import queue
+import sys
+from pathlib import Path
+
+from .constants import PROJECT_ROOT
+
+# Directory the log file goes in: next to the executable when frozen, the
+# project root in development. Resolved once per process.
+_BASE_PATH = Path(sys.executable).parent if getattr(sys, 'frozen', False) else PROJECT_ROOT
+
+# Background thread writing queued log records; see setup_logger()
+_log_listener = None
+
+@functools.lru_cache(maxsize=1)
+def setup_logger():
+    """
+    Set up logging to write to a file next to the executable.
+    Only configures logging on the first call, so handlers are never
+    installed twice; returns the log file path.
+    
+    Records are handed to a queue and written by a background listener
+    thread, so the game loop never blocks on log file or console I/O.
+    """
+    global _log_listener
+    
+    log_file = _BASE_PATH / "mars-x.log"
+    
+    # The formats never use thread/process fields; skip looking them up
+    # for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    # Log file, opened on the first record written
+    file_handler = logging.FileHandler(str(log_file), delay=True)
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    
+    # Add console handler to print logs to stdout as well
+    console = logging.StreamHandler()
+    console.setLevel(logging.DEBUG)
+    formatter = logging.Formatter('%(levelname)s: %(message)s')
+    console.setFormatter(formatter)
+    
+    # The root logger only enqueues; the listener does the writing
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger('')
+    root.setLevel(logging.DEBUG)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(stop_logger)
+    
+    return log_file
+
+def stop_logger():
+    """Flush queued log records and stop the background listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
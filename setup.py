@@ -5,16 +5,22 @@ Mars-X setup script for environment setup and package installation.
 
 import os
 import sys
-import subprocess
-import re
-import shutil
 from pathlib import Path
-import time
 
 # Path to virtual environment
-VENV_DIR = Path(__file__).resolve().parent / ".venv"
 PROJECT_ROOT = Path(__file__).resolve().parent
+VENV_DIR = PROJECT_ROOT / ".venv"
 BUILD_DIR = PROJECT_ROOT / "build"
+WHEELHOUSE = PROJECT_ROOT / "wheels"  # Optional local wheels for offline installs
+PYTHON_312_CACHE = PROJECT_ROOT / ".python312_path"  # Last interpreter found by 'py -0p'
+# Copy of the last fully installed venv, restored instead of rebuilding it
+VENV_TEMPLATE = Path.home() / ".cache" / "mars_x" / "venv-template"
+
+# Venv executables, resolved once
+IS_WINDOWS = os.name == 'nt'
+VENV_BIN = VENV_DIR / ("Scripts" if IS_WINDOWS else "bin")
+PYTHON_EXE = VENV_BIN / ("python.exe" if IS_WINDOWS else "python")
+PIP_EXE = VENV_BIN / ("pip.exe" if IS_WINDOWS else "pip")
 
 def print_help():
     print("""
@@ -24,37 +30,96 @@ Usage: python setup.py [options]
 
 Options:
   --build     Build the game executable
+  --clean     With --build, discard cached build artifacts first
+  --refresh-wheels
+              Download wheels for requirements.txt into wheels/ and
+              install from there from then on
   --help      Show this help message and exit
     """)
 
 
 def find_python_3_12():
+    # The running interpreter needs no lookup
+    if sys.version_info[:2] == (3, 12):
+        return Path(sys.executable)
+    
+    # Reuse the last lookup while that interpreter is still installed
+    if PYTHON_312_CACHE.exists():
+        python_path = Path(PYTHON_312_CACHE.read_text().strip())
+        if python_path.exists():
+            return python_path
+    
+    import re
+    import subprocess
+    
+    pattern = re.compile(r"^-V:3\.12(?:-64|-32)?\s+(\S+)")
     try:
-        output = subprocess.check_output(["py", "-0p"], text=True)
-        for line in output.splitlines():
-            line = line.strip()
-            match = re.match(r"^-V:3\.12(?:-64|-32)?\s+(\S+)", line)
-            if match:
-                python_path = Path(match.group(1))
-                print(f"Found Python 3.12 at: {python_path}")
-                return python_path
+        # Read the launcher's list as it is printed and stop at the first match
+        with subprocess.Popen(["py", "-0p"], stdout=subprocess.PIPE, text=True) as proc:
+            for line in proc.stdout:
+                match = pattern.match(line.strip())
+                if match:
+                    proc.terminate()
+                    python_path = Path(match.group(1))
+                    print(f"Found Python 3.12 at: {python_path}")
+                    PYTHON_312_CACHE.write_text(str(python_path))
+                    return python_path
+        if proc.returncode:
+            print(f"Error executing 'py -0p': exit status {proc.returncode}")
+            return None
         print("Python 3.12 not found.")
         return None
-    except subprocess.CalledProcessError as e:
+    except OSError as e:
         print(f"Error executing 'py -0p': {e}")
         return None
 
+def restore_venv_template(req_hash):
+    """
+    Copy the template venv into place if it was taken from this VENV_DIR
+    with the same requirements. A venv hard-codes its own path in its
+    scripts and pyvenv.cfg, so it is only valid at the path it came from.
+    """
+    import shutil
+    
+    origin = VENV_TEMPLATE / ".origin"
+    stamp = VENV_TEMPLATE / ".requirements.sha256"
+    if not (origin.exists() and stamp.exists()):
+        return False
+    if origin.read_text() != str(VENV_DIR) or stamp.read_text().strip() != req_hash:
+        return False
+    print(f"Restoring virtual environment from {VENV_TEMPLATE}...")
+    shutil.copytree(VENV_TEMPLATE, VENV_DIR, symlinks=True)
+    return True
+
+def save_venv_template():
+    """Replace the template with a copy of the freshly installed venv."""
+    import shutil
+    
+    if VENV_TEMPLATE.exists():
+        shutil.rmtree(VENV_TEMPLATE)
+    shutil.copytree(VENV_DIR, VENV_TEMPLATE, symlinks=True)
+    (VENV_TEMPLATE / ".origin").write_text(str(VENV_DIR))
+
 def manage_venv():
+    import hashlib
+    import subprocess
+    
     python_3_12_path = find_python_3_12()
     if not python_3_12_path:
         print("Python 3.12 not found. Please install it and try again.")
         sys.exit(1)
 
-    # Create venv only if it doesn't exist
-    if not VENV_DIR.exists():
+    req_file = PROJECT_ROOT / "requirements.txt"
+    req_hash = hashlib.sha256(req_file.read_bytes()).hexdigest()
+    
+    # Create venv only if it doesn't exist; a matching template is copied
+    # instead of running venv and pip again
+    if not VENV_DIR.exists() and restore_venv_template(req_hash):
+        print("Virtual environment restored.")
+    elif not VENV_DIR.exists():
         print("Creating virtual environment with Python 3.12...")
         try:
-            subprocess.run([str(python_3_12_path), "-m", "venv", str(VENV_DIR)], check=True)
+            subprocess.run([os.fspath(python_3_12_path), "-m", "venv", os.fspath(VENV_DIR)], check=True)
             print("Virtual environment created.")
         except subprocess.CalledProcessError as e:
             print(f"Error creating virtual environment: {e}")
@@ -62,12 +127,7 @@ def manage_venv():
     else:
         print("Using existing virtual environment.")
     
-    if os.name == 'nt':
-        python_exe = VENV_DIR / "Scripts" / "python.exe"
-        pip_exe = VENV_DIR / "Scripts" / "pip.exe"
-    else:
-        python_exe = VENV_DIR / "bin" / "python"
-        pip_exe = VENV_DIR / "bin" / "pip"
+    python_exe = PYTHON_EXE
     
     if not python_exe.exists():
         print(f"Error: Python executable not found at {python_exe}")
@@ -75,21 +135,37 @@ def manage_venv():
 
     # Upgrade pip and install dependencies from requirements.txt
     print("Setting up virtual environment...")
-    subprocess.run([str(python_exe), "-m", "ensurepip", "--upgrade"], check=True)
-    subprocess.run([str(python_exe), "-m", "pip", "install", "--upgrade", "pip"], check=True)
+    # venv already installs pip; only bootstrap it when it is missing
+    if not PIP_EXE.exists():
+        subprocess.run([os.fspath(python_exe), "-m", "ensurepip", "--upgrade"], check=True)
     
-    # Install requirements from requirements.txt
-    req_file = PROJECT_ROOT / "requirements.txt"
-    # Use pip directly instead of any UV command
-    subprocess.run([str(python_exe), "-m", "pip", "install", "-r", str(req_file)], check=True)
+    # Install requirements from requirements.txt, upgrading pip in the same
+    # resolver run; skipped while requirements.txt matches the last install
+    req_stamp = VENV_DIR / ".requirements.sha256"
+    if req_stamp.exists() and req_stamp.read_text().strip() == req_hash:
+        print("Requirements up-to-date")
+    else:
+        # Use pip directly instead of any UV command
+        pip_cmd = [os.fspath(python_exe), "-m", "pip", "install", "--upgrade", "pip", "-r", os.fspath(req_file)]
+        if WHEELHOUSE.exists():
+            # Resolve from the local wheelhouse only; no index lookups
+            pip_cmd += ["--no-index", f"--find-links={WHEELHOUSE}"]
+        subprocess.run(pip_cmd, check=True)
+        # Record what was installed, so builds can skip pip until it changes
+        req_stamp.write_text(req_hash)
+        # Keep a copy to restore if .venv is deleted
+        try:
+            save_venv_template()
+        except OSError as e:
+            print(f"Warning: could not save the venv template: {e}")
     
     print("Setup complete.")
     
     # Print activation instructions
-    if os.name == 'nt':
-        activate_cmd = str(VENV_DIR / "Scripts" / "activate.bat")
+    if IS_WINDOWS:
+        activate_cmd = str(VENV_BIN / "activate.bat")
     else:
-        activate_cmd = f"source {VENV_DIR / 'bin' / 'activate'}"
+        activate_cmd = f"source {VENV_BIN / 'activate'}"
     
     print(f"""
 Next steps:
@@ -107,112 +183,59 @@ Next steps:
 # Add this section to setup.py to compile Cython modules before building
 
 def compile_cython_modules():
-    """Compile all Cython modules in the project."""
-    from setuptools.extension import Extension
-    from setuptools import setup
-    from Cython.Build import cythonize
-    import shutil
-    import sys
-    
-    # Save the original command line arguments
-    old_argv = sys.argv.copy()
+    """
+    Compile all Cython modules in the project. The extension list and
+    compiler directives live in the build helper, which build_game.py
+    runs as well, so both builds use the same settings.
+    """
+    import subprocess
     
-    # Replace with minimal arguments for setup
-    sys.argv = [sys.argv[0], 'build_ext', '--inplace']
+    print("Compiling Cython modules...")
+    subprocess.run(
+        [sys.executable, os.fspath(PROJECT_ROOT / "mars_x" / "utils" / "_build_helpers" / "cython_build.py"), os.fspath(BUILD_DIR)],
+        cwd=PROJECT_ROOT,
+        check=True
+    )
     
-    try:
-        # Define the extensions
-        extensions = [
-            Extension(
-                "mars_x.cython_modules.vector", 
-                ["mars_x/cython_modules/vector.pyx"]
-            ),
-            Extension(
-                "mars_x.cython_modules.collision", 
-                ["mars_x/cython_modules/collision.pyx"]
-            ),
-            Extension(
-                "mars_x.cython_modules.matrix", 
-                ["mars_x/cython_modules/matrix.pyx"]
-            ),
-            Extension(
-                "mars_x.cython_modules.quaternion", 
-                ["mars_x/cython_modules/quaternion.pyx"]
-            ),
-            Extension(
-                "mars_x.cython_modules.rigidbody", 
-                ["mars_x/cython_modules/rigidbody.pyx"]
-            ),
-        ]
-        
-        # Compile
-        print("Compiling Cython modules...")
-        setup(
-            name="mars_x_cython_modules",
-            ext_modules=cythonize(
-                extensions,
-                compiler_directives={
-                    'language_level': 3,
-                    'boundscheck': False,
-                    'wraparound': False
-                }
-            )
-        )
-    finally:
-        # Restore original command line arguments
-        sys.argv = old_argv
-    
-    # Move the compiled files to the correct location if needed
+    # The helper builds in place; make sure the modules landed there
     print("Checking for compiled modules...")
-    # Check both common locations: direct in package or in build directory
-    
-    # First check if files were built in-place (--inplace option)
     cython_dir = PROJECT_ROOT / "mars_x" / "cython_modules"
-    modules_found = False
-    
-    for ext in ['.pyd', '.so']:
-        if list(cython_dir.glob(f"*{ext}")):
-            modules_found = True
-            break
-    
-    # If not found in-place, check build directory
-    if not modules_found:
-        build_dirs = [d for d in (PROJECT_ROOT / "build").glob("lib.*")]
-        if build_dirs:
-            source_path = build_dirs[0] / "mars_x" / "cython_modules"
-            if source_path.exists():
-                dest_path = PROJECT_ROOT / "mars_x" / "cython_modules"
-                for ext in ['.pyd', '.so']:
-                    for file in source_path.glob(f"*{ext}"):
-                        target = dest_path / file.name
-                        print(f"Moving {file} to {target}")
-                        shutil.copy2(file, target)
-                modules_found = True
-    
-    if modules_found:
+    if any(cython_dir.glob("*.pyd")) or any(cython_dir.glob("*.so")):
         print("Cython modules compiled successfully.")
     else:
         print("Warning: Could not find compiled Cython modules.")
 
+def refresh_wheels():
+    """Populate the wheelhouse with pip and everything in requirements.txt."""
+    import subprocess
+    
+    req_file = PROJECT_ROOT / "requirements.txt"
+    print(f"Downloading wheels into {WHEELHOUSE}...")
+    subprocess.run(
+        [os.fspath(get_venv_python()), "-m", "pip", "wheel", "-w", os.fspath(WHEELHOUSE), "pip", "-r", os.fspath(req_file)],
+        check=True
+    )
+
 # Function to activate the virtual environment and get the Python executable
 def get_venv_python():
-    if os.name == 'nt':
-        python_exe = VENV_DIR / "Scripts" / "python.exe"
-    else:
-        python_exe = VENV_DIR / "bin" / "python"
-    
-    if not python_exe.exists():
-        print(f"Error: Python executable not found at {python_exe}")
+    if not PYTHON_EXE.exists():
+        print(f"Error: Python executable not found at {PYTHON_EXE}")
         print("Please run 'python setup.py' first to create the virtual environment.")
         sys.exit(1)
         
-    return python_exe
+    return PYTHON_EXE
 
 def main():
     if '--help' in sys.argv or '-h' in sys.argv:
         print_help()
         return
     
+    if '--refresh-wheels' in sys.argv:
+        if not VENV_DIR.exists():
+            manage_venv()
+        refresh_wheels()
+        return
+    
     if '--build' in sys.argv:
         # Make sure venv exists
         if not VENV_DIR.exists():
@@ -221,6 +244,7 @@ def main():
         
         # Get Python executable from venv
         python_exe = get_venv_python()
+        import subprocess
         
         # Import the build_game function from the new location
         try:
@@ -231,8 +255,9 @@ def main():
             build_script = PROJECT_ROOT / "mars_x" / "utils" / "build_game.py"
             if build_script.exists():
                 print(f"Running build script with {python_exe}")
+                build_args = ['--clean'] if '--clean' in sys.argv else []
                 result = subprocess.run(
-                    [str(python_exe), str(build_script)],
+                    [os.fspath(python_exe), os.fspath(build_script), *build_args],
                     check=True
                 )
                 return
@@ -240,7 +265,7 @@ def main():
                 # Fallback to importing the function if script not found
                 from mars_x.utils.build_game import build_game
                 compile_cython_modules()
-                build_game()
+                build_game(clean='--clean' in sys.argv)
         except ImportError as e:
             print(f"Error importing build_game module: {e}")
             print("Make sure the mars_x/utils directory exists and contains build_game.py")